@@ -0,0 +1,2 @@
+from .main import run
+from .golden import record, run_compare
\ No newline at end of file
@@ -0,0 +1,89 @@
+import json
+import random as rnd
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from core import ProgramRunner, baking
+from core.colors import ArrayStripBuffer
+from core.recording import Recorder, Recording
+from .main import DT, SEED, _cases
+
+FRAMES = 480
+LEDS = 149
+
+def _start(runner: ProgramRunner, target: str, seed: int) -> str:
+    for kind, name, start in _cases(runner):
+        qualified = '{}:{}'.format(kind, name)
+        if target in (name, qualified):
+            rnd.seed(seed)
+            np.random.seed(seed)
+            start()
+            return qualified
+
+    raise KeyError('unknown effect or program {!r}'.format(target))
+
+@baking.synchronous()
+def record(target: str, path: str, frames: int = FRAMES, n: int = LEDS, seed: int = SEED, dt: float = DT) -> None:
+    runner = ProgramRunner(ArrayStripBuffer(n))
+    name = _start(runner, target, seed)
+
+    with Recorder(path, n, name, seed) as recorder:
+        runner.recorder = recorder
+        for _ in range(frames):
+            runner.update(dt)
+        runner.recorder = None
+
+    print('Recorded {} frames of {} at {} leds to {}'.format(frames, name, n, path), file=sys.stderr)
+
+@baking.synchronous()
+def compare(path: str) -> dict:
+    recording = Recording(path)
+    runner = ProgramRunner(ArrayStripBuffer(recording.n))
+    try:
+        _start(runner, recording.name, recording.seed)
+    except KeyError:
+        # show recordings follow the schedule, there is no single target to replay them with
+        raise KeyError('{} records {!r}, which is not an effect or program that can be replayed'.format(path, recording.name)) from None
+
+    expected = recording.frames
+    count = len(recording)
+    times = np.empty(count)
+    first = None
+    differing = 0
+    for i, dt in enumerate(recording.dt.tolist()):
+        t0 = perf_counter()
+        runner.update(dt)
+        times[i] = perf_counter() - t0
+
+        pixels = np.flatnonzero((runner.strip.array != expected[i]).any(axis=1))
+        if len(pixels):
+            differing += 1
+            if first is None:
+                p = int(pixels[0])
+                first = {'frame': i, 'pixel': p, 'expected': expected[i][p].tolist(), 'actual': runner.strip.array[p].tolist()}
+
+    # an empty recording trivially matches, it has no timing to report
+    recorded = np.diff(recording.t)
+    return {
+        'name': recording.name,
+        'leds': recording.n,
+        'frames': count,
+        'match': first is None,
+        'differing_frames': differing,
+        'first_difference': first,
+        'recorded_frame_ms': float(recorded.mean() * 1000.) if len(recorded) else None,
+        'replay_frame_ms': float(times.mean() * 1000.) if count else None,
+        'replay_p99_ms': float(np.percentile(times, 99) * 1000.) if count else None,
+    }
+
+def run_compare(path: str) -> bool:
+    try:
+        report = compare(path)
+    except KeyError as e:
+        print(e.args[0], file=sys.stderr)
+        return False
+    json.dump(report, sys.stdout, indent=1)
+    print()
+    return report['match']
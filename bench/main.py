@@ -0,0 +1,125 @@
+import gc
+import json
+import platform
+import random as rnd
+import sys
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+
+import core.program as prg
+from core import baking
+from core import ProgramRunner
+from core.colors import ArrayStripBuffer
+from vis.mock_prg import TestPrg
+
+SIZES = (60, 149, 600, 1500, 10000)
+FRAMES = 240
+WARMUP = 24
+TRACED_FRAMES = 48
+SEED = 1234
+DT = 1. / 24.
+
+FORMAT_VERSION = 2
+
+def _cases(runner: ProgramRunner):
+    for name, effect in TestPrg.effects(runner).items():
+        yield ('effect', name, lambda effect=effect: runner.start(TestPrg([effect])))
+
+    for name, program in TestPrg.programs(runner).items():
+        if issubclass(program, prg.FxLoopProgram):
+            # short cycle so the timed window includes effect transitions
+            start = lambda program=program: runner.start(program(), delay=4, fade=2)
+        else:
+            start = lambda program=program: runner.start(program())
+        yield ('program', name, start)
+
+def _prepare(runner, start, seed):
+    rnd.seed(seed)
+    np.random.seed(seed)
+    runner.strip.fill(0)
+    start()
+    for _ in range(WARMUP):
+        runner.update(DT)
+
+def _measure(runner, start, frames, seed):
+    cache = baking.default_cache
+    cache.clear()
+    baked = cache.bake_time
+    _prepare(runner, start, seed)
+    bake_time = cache.bake_time - baked
+
+    times = [0.] * frames
+    gc.collect()
+    for i in range(frames):
+        t0 = perf_counter()
+        runner.update(DT)
+        times[i] = perf_counter() - t0
+
+    _prepare(runner, start, seed)
+
+    # the peak catches buffers freed within the frame, the snapshot diff counts the blocks it leaves allocated
+    traced = min(frames, TRACED_FRAMES)
+    peak_growth = 0
+    blocks = 0
+    ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+    tracemalloc.start()
+    for _ in range(traced):
+        before = tracemalloc.take_snapshot().filter_traces(ignore)
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        runner.update(DT)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_growth += peak - current
+        after = tracemalloc.take_snapshot().filter_traces(ignore)
+        blocks += sum(stat.count_diff for stat in after.compare_to(before, 'lineno') if stat.count_diff > 0)
+    tracemalloc.stop()
+
+    times = np.array(times)
+    return {
+        'fps': frames / times.sum(),
+        'mean_ms': times.mean() * 1000.,
+        'p50_ms': np.percentile(times, 50) * 1000.,
+        'p99_ms': np.percentile(times, 99) * 1000.,
+        'bake_ms': bake_time * 1000.,
+        'allocs_per_frame': blocks / traced,
+        'peak_alloc_bytes_per_frame': peak_growth // traced,
+    }
+
+@baking.synchronous()
+def bench(sizes=SIZES, frames=FRAMES, seed=SEED, only=None):
+    results = []
+    for n in sizes:
+        runner = ProgramRunner(ArrayStripBuffer(n))
+        for kind, name, start in _cases(runner):
+            if only and name not in only:
+                continue
+
+            stats = _measure(runner, start, frames, seed)
+            results.append(dict(kind=kind, name=name, leds=n, **stats))
+            print('{:>7} {:<20} {:>6} leds {:>9.1f} fps  p50 {:>8.3f} ms  p99 {:>8.3f} ms  bake {:>8.1f} ms  {:>7.1f} allocs {:>9} B peak/frame'.format(
+                kind, name, n, stats['fps'], stats['p50_ms'], stats['p99_ms'], stats['bake_ms'], stats['allocs_per_frame'],
+                stats['peak_alloc_bytes_per_frame']),
+                file=sys.stderr)
+        runner.start(None)
+
+    return {
+        'version': FORMAT_VERSION,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'seed': seed,
+        'frames': frames,
+        'dt': DT,
+        'results': results,
+    }
+
+def run(sizes=SIZES, frames=FRAMES, seed=SEED, only=None, output=None):
+    report = bench(sizes, frames, seed, only)
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
@@ -1,9 +1,79 @@
 import importlib as _imp
-import pkgutil as _pkg
-
-for mod_info in _pkg.walk_packages(__path__, __name__ + '.'):
-    mod = _imp.import_module(mod_info.name)
-    names = mod.__dict__.get('__all__')
-    if not names:
-        names = [k for k in mod.__dict__ if not k.startswith('_')]
-    globals().update({k: getattr(mod, k) for k in names})
\ No newline at end of file
+
+# Submodules are imported on first use of one of their public names, so
+# `from core import ProgramRunner` does not pull in every effect and output.
+# The table only saves parsing sources for common names, anything missing
+# from it is found by scanning every submodule's __all__ or public names.
+_modules = {
+    'baking': ['FrameCache', 'BakedEffect', 'bake', 'synchronous'],
+    'colors': ['StripBuffer', 'ArrayStripBuffer', 'WireStripBuffer', 'write_frame', 'read_frame', 'rainbow'],
+    'compositor': ['Layer', 'Compositor'],
+    'effects': ['Color', 'Colors', 'Effect', 'EFFECTS', 'Param', 'REQUIRED', 'register', 'ColorTrain', 'Rotate', 'Breath',
+                'Wave', 'Twinkle', 'FireworkRocket', 'FireworkExplosion', 'color_train', 'rotate', 'breath', 'wave',
+                'twinkle', 'firework_rocket', 'firework_explosion'],
+    'governor': ['Quality', 'Governor', 'QUALITY_LEVELS'],
+    'metrics': ['Registry', 'Counter', 'Gauge', 'Histogram', 'RunnerMetrics', 'MetricsServer', 'effect_name', 'REGISTRY'],
+    'output': ['ColorCorrection', 'Output', 'PipelinedOutput'],
+    'palette': ['Palette'],
+    'particles': ['ParticleSystem'],
+    'program': ['ProgramRunner'],
+    'recording': ['Recorder', 'Recording', 'load_recording'],
+    'schedule': ['Schedule', 'Conflict'],
+    'segments': ['Segment', 'SegmentRunner'],
+    'startup': ['ImportTimer', 'enable', 'mark', 'first_frame', 'report'],
+    'timing': ['FrameScheduler'],
+    'utils': ['split_color', 'recombine', 'split_colors', 'recombine_colors', 'clamp', 'lerp', 'blend', 'blend_max',
+              'fade', 'cubic', 'fade_ease', 'blend_frame', 'blend_max_frame', 'fade_frame', 'EggClockTimer'],
+}
+_exports = {name: module for module, names in _modules.items() for name in names}
+_scanned = False
+
+def _public_names(path):
+    import ast
+
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), path)
+
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id == '__all__':
+                    return ast.literal_eval(node.value)
+                if isinstance(target, ast.Name):
+                    names.append(target.id)
+        elif isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            names.append(node.name)
+    return [k for k in names if not k.startswith('_')]
+
+def _scan():
+    global _scanned
+    if not _scanned:
+        import os
+        import pkgutil
+
+        _scanned = True
+        for mod_info in pkgutil.iter_modules(__path__):
+            path = os.path.join(__path__[0], mod_info.name + '.py')
+            if os.path.exists(path):
+                for name in _public_names(path):
+                    _exports.setdefault(name, mod_info.name)
+    return _exports
+
+def __getattr__(name):
+    if name == '__all__':
+        return list(_scan())
+
+    if name in _modules:
+        return _imp.import_module('.' + name, __name__)
+
+    module = _exports.get(name) or _scan().get(name)
+    if module is None:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+    value = getattr(_imp.import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_scan()))
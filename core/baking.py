@@ -0,0 +1,267 @@
+import copy
+import hashlib
+import os
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from time import perf_counter
+
+import numpy as np
+
+from .colors import ArrayStripBuffer, write_frame
+
+__all__ = ['FrameCache', 'BakedEffect', 'bake', 'synchronous']
+
+_has_period = lambda obj: callable(getattr(obj, 'period', None))
+_is_resettable = lambda obj: callable(getattr(obj, 'reset', None))
+
+# bake on a worker thread and play the effect live until the frames are ready
+BACKGROUND = True
+
+@contextmanager
+def synchronous():
+    # bake in line, for tools whose output must not depend on thread timing
+    global BACKGROUND
+    previous, BACKGROUND = BACKGROUND, False
+    try:
+        yield
+    finally:
+        BACKGROUND = previous
+
+class FrameCache:
+    def __init__(self, budget: int = 32 << 20, spill_threshold: int = 8 << 20, spill_dir: str = None):
+        self.budget = budget
+        self.spill_threshold = spill_threshold
+        self.spill_dir = spill_dir
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bakes = 0
+        self.bake_time = 0.
+        self._entries = OrderedDict()
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key) -> np.ndarray:
+        frames = self._entries.get(key)
+        if frames is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return frames
+
+    def put(self, key, frames: np.ndarray) -> np.ndarray:
+        self.discard(key)
+
+        if frames.nbytes > self.spill_threshold:
+            frames = self._spill(key, frames)
+        else:
+            frames = np.ascontiguousarray(frames)
+        frames.setflags(write=False)
+
+        self._entries[key] = frames
+        self.size += frames.nbytes
+        while self.size > self.budget and len(self._entries) > 1:
+            self._evict(next(iter(self._entries)))
+            self.evictions += 1
+        return frames
+
+    def discard(self, key) -> None:
+        if key in self._entries:
+            self._evict(key)
+
+    def clear(self) -> None:
+        while self._entries:
+            self._evict(next(iter(self._entries)))
+
+    def stats(self) -> dict:
+        return {'entries': len(self._entries), 'bytes': self.size, 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'bakes': self.bakes, 'bake_ms': self.bake_time * 1000.}
+
+    def _spill(self, key, frames: np.ndarray) -> np.ndarray:
+        name = 'outdoor_leds-{}.npy'.format(hashlib.sha1(repr(key).encode()).hexdigest()[:16])
+        path = os.path.join(self.spill_dir or tempfile.gettempdir(), name)
+        mm = np.lib.format.open_memmap(path, mode='w+', dtype=frames.dtype, shape=frames.shape)
+        mm[:] = frames
+        mm.flush()
+        del mm
+        return np.load(path, mmap_mode='r')
+
+    def _evict(self, key) -> None:
+        frames = self._entries.pop(key)
+        self.size -= frames.nbytes
+        if isinstance(frames, np.memmap):
+            try:
+                os.remove(frames.filename)
+            except OSError:
+                pass
+
+default_cache = FrameCache()
+
+class BakedEffect:
+    MAX_FRAMES = 4096
+    MIN_VERIFY_FRAMES = 96
+    MAX_BAKE_BYTES = 64 << 20
+
+    def __init__(self, key, factory, args = (), kwargs = {}, period: int = None, dt: float = 1. / 24., cache: FrameCache = None):
+        self._key = key
+        self._factory = factory
+        self._args = args
+        self._kwargs = kwargs
+        self._period = period
+        self._dt = dt
+        self._cache = cache if cache is not None else default_cache
+        self._live = None
+        self._resettable = True
+        self._t = 0.
+        self._n = None
+        self._baked = None
+        self._job = None
+        self._preview = None
+
+    @property
+    def name(self) -> str:
+        return getattr(self._factory, 'name', None) or self._factory.__name__
+
+    def reset(self, runner):
+        if self._live is not None:
+            if _is_resettable(self._live):
+                self._live.reset(runner)
+            return
+
+        if self._preview is not None and _is_resettable(self._preview):
+            self._preview.reset(runner)
+        if self._resettable:
+            self._t = 0.
+
+    def prepare(self, n: int) -> None:
+        # programs call this when they start so baking does not land in the middle of a show
+        if self._live is not None or self._n == n:
+            return
+
+        self._n = n
+        frames = self._cache.get((self._key, n, self._dt))
+        if frames is not None:
+            self._baked = weakref.ref(frames)
+            return
+
+        if BACKGROUND:
+            job = self._job = _BakeJob(self, n)
+            job.start()
+            self._preview = self._create()
+        else:
+            t0 = perf_counter()
+            self._finish(n, self._bake(n), perf_counter() - t0)
+
+    def _finish(self, n: int, frames: np.ndarray, elapsed: float) -> None:
+        self._job = None
+        self._cache.bakes += 1
+        self._cache.bake_time += elapsed
+        if frames is None:
+            # no repeating cycle found, render it every frame instead
+            self._live = self._preview or self._create()
+        else:
+            self._baked = weakref.ref(self._cache.put((self._key, n, self._dt), frames))
+        self._preview = None
+
+    def _frames(self, n: int) -> np.ndarray:
+        # only the cache holds the frames, so evicting them frees the memory and they are baked again
+        if self._baked is not None and self._baked() is None:
+            self._baked = None
+            self._n = None
+        if self._n != n:
+            self.prepare(n)
+        job = self._job
+        if job is not None and not job.is_alive():
+            if job.error is not None:
+                raise job.error
+            self._finish(n, job.frames, job.elapsed)
+        return self._baked() if self._baked is not None else None
+
+    def _create(self):
+        # each instance gets its own copy of the arguments, so a color iterator is never advanced by two of them
+        return self._factory(*copy.deepcopy(self._args), **copy.deepcopy(self._kwargs))
+
+    def _bake(self, n: int) -> np.ndarray:
+        fx = self._create()
+        self._resettable = _is_resettable(fx)
+        strip = ArrayStripBuffer(n)
+
+        period = self._period
+        if period is None and _has_period(fx):
+            period = fx.period(n, self._dt)
+
+        if period:
+            frames = np.empty((period, n, 3), dtype=np.uint8)
+            for i in range(period):
+                fx(strip, self._dt)
+                frames[i] = strip.array
+            return frames
+
+        limit = max(2, min(self.MAX_FRAMES, self.MAX_BAKE_BYTES // (n * 3)))
+        frames = np.empty((limit, n, 3), dtype=np.uint8)
+        starts = []
+        candidate = None
+        for i in range(limit):
+            fx(strip, self._dt)
+            frames[i] = strip.array
+            if i == 0:
+                continue
+
+            if np.array_equal(frames[i], frames[0]):
+                starts.append(i)
+
+            # a period is accepted once a whole second cycle repeated the first one
+            while candidate is not None and not np.array_equal(frames[i], frames[i - candidate]):
+                later = [p for p in starts if p > candidate and np.array_equal(frames[p:i + 1], frames[:i + 1 - p])]
+                candidate = later[0] if later else None
+            if candidate is None and starts and starts[-1] == i:
+                candidate = i
+            if candidate is not None and i + 1 >= max(2 * candidate, self.MIN_VERIFY_FRAMES):
+                # a copy, so the cache does not keep the whole detection buffer alive
+                return frames[:candidate].copy()
+
+        return None
+
+    def __call__(self, leds, dt):
+        frames = self._frames(leds.n) if self._live is None else None
+        if self._live is not None:
+            self._live(leds, dt)
+            return
+
+        if frames is None:
+            # still baking, the preview instance runs in step with the playback clock
+            self._preview(leds, dt)
+        else:
+            write_frame(leds, frames[int(self._t / self._dt + .5) % len(frames)])
+        self._t += dt
+
+class _BakeJob(threading.Thread):
+    def __init__(self, effect: BakedEffect, n: int):
+        super().__init__(name='led-bake', daemon=True)
+        self._effect = effect
+        self._n = n
+        self.frames = None
+        self.error = None
+        self.elapsed = 0.
+
+    def run(self):
+        t0 = perf_counter()
+        try:
+            self.frames = self._effect._bake(self._n)
+        except Exception as e:
+            self.error = e
+        self.elapsed = perf_counter() - t0
+
+def bake(factory, *args, period: int = None, dt: float = 1. / 24., cache: FrameCache = None, **kwargs) -> BakedEffect:
+    key = (factory.__module__, factory.__qualname__, repr(args), repr(sorted(kwargs.items())))
+    return BakedEffect(key, factory, args, kwargs, period, dt, cache)
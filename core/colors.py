@@ -1,6 +1,7 @@
 from collections.abc import MutableSequence, Sequence, Iterator
 from typing import Union
-from .utils import recombine
+import numpy as np
+from .utils import recombine, split_color, split_colors, recombine_colors
 
 class StripBuffer(Sequence):
     Color = Union[int, tuple[int, int, int]]
@@ -10,8 +11,10 @@ class StripBuffer(Sequence):
         self._buf = [0] * size 
 
     def fill(self, color):
-        for i in range(self._n):
-            self._buf[i] = color
+        self._buf[:] = [color] * self._n
+
+    def show(self) -> None:
+        pass
 
     @property
     def n(self) -> int:
@@ -35,6 +38,145 @@ class StripBuffer(Sequence):
                 return True
         return False
 
+class ArrayStripBuffer(StripBuffer):
+    def __init__(self, size: int):
+        self._n = size
+        self._buf = np.zeros((size, 3), dtype=np.uint8)
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._buf
+
+    def view(self, start: int, stop: int) -> 'ArrayStripBuffer':
+        segment = ArrayStripBuffer.__new__(ArrayStripBuffer)
+        segment._buf = self._buf[start:stop]
+        segment._n = len(segment._buf)
+        return segment
+
+    def fill(self, color):
+        self._buf[:] = split_color(color if type(color) is tuple else int(color))
+
+    def assign(self, frame) -> None:
+        self._buf[:] = split_colors(frame)
+
+    def __iter__(self):
+        return iter(recombine_colors(self._buf).tolist())
+
+    def __getitem__(self, idx):
+        if type(idx) is slice:
+            return recombine_colors(self._buf[idx]).tolist()
+        r, g, b = self._buf[idx].tolist()
+        return r << 16 | g << 8 | b
+
+    def __setitem__(self, idx, val) -> None:
+        if type(idx) is slice:
+            self._buf[idx] = split_colors(val)
+        else:
+            self._buf[idx] = split_color(val if type(val) is tuple else int(val))
+
+    def __contains__(self, val: StripBuffer.Color) -> bool:
+        c = split_color(val if type(val) is tuple else int(val))
+        return bool((self._buf == c).all(axis=1).any())
+
+class WireStripBuffer(StripBuffer):
+    def __init__(self, size: int, order: str = 'GRB', buf: bytearray = None, offset: int = 0, device = None):
+        self._n = size
+        self._order = order
+        self._channels = np.array(['RGB'.index(c) for c in order])
+        self._positions = np.array([order.index(c) for c in 'RGB'])
+        self._bytes = buf if buf is not None else bytearray(size * 3)
+        self._offset = offset
+        self._wire = np.frombuffer(self._bytes, dtype=np.uint8, count=size * 3, offset=offset).reshape(size, 3)
+        self._device = device
+
+    @classmethod
+    def adopt(cls, device):
+        # wrap the transmit buffer of an adafruit_pixelbuf based driver (neopixel)
+        buf = getattr(device, '_post_brightness_buffer', None)
+        order = getattr(device, 'byteorder', None)
+        if type(buf) is not bytearray or getattr(device, '_pre_brightness_buffer', None) is not None:
+            return None
+        if type(order) is not str or sorted(order) != ['B', 'G', 'R']:
+            return None
+        return cls(len(device), order, buf, getattr(device, '_offset', 0), device)
+
+    def clone(self) -> 'WireStripBuffer':
+        return WireStripBuffer(self._n, self._order, bytearray(len(self._bytes)), self._offset)
+
+    def attach(self, device) -> None:
+        # make the driver transmit from this buffer, see adopt()
+        device._post_brightness_buffer = self._bytes
+        self._device = device
+
+    @property
+    def order(self) -> str:
+        return self._order
+
+    @property
+    def channels(self) -> np.ndarray:
+        return self._channels
+
+    @property
+    def buffer(self) -> memoryview:
+        return memoryview(self._bytes)
+
+    @property
+    def wire(self) -> np.ndarray:
+        return self._wire
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._wire[:, self._positions]
+
+    def fill(self, color):
+        c = split_color(color if type(color) is tuple else int(color))
+        self._wire[:] = [c[ch] for ch in self._channels]
+
+    def assign(self, frame) -> None:
+        frame = split_colors(frame)
+        if frame.ndim == 1:
+            self._wire[:] = frame[self._channels]
+        else:
+            np.take(frame, self._channels, axis=1, out=self._wire)
+
+    def show(self) -> None:
+        if self._device is not None:
+            self._device.show()
+
+    def __iter__(self):
+        return iter(recombine_colors(self.array).tolist())
+
+    def __getitem__(self, idx):
+        if type(idx) is slice:
+            return recombine_colors(self._wire[idx][:, self._positions]).tolist()
+        r, g, b = self._wire[idx][self._positions].tolist()
+        return r << 16 | g << 8 | b
+
+    def __setitem__(self, idx, val) -> None:
+        if type(idx) is slice:
+            self._wire[idx] = split_colors(val)[..., self._channels]
+        else:
+            c = split_color(val if type(val) is tuple else int(val))
+            self._wire[idx] = [c[ch] for ch in self._channels]
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __contains__(self, val: StripBuffer.Color) -> bool:
+        c = split_color(val if type(val) is tuple else int(val))
+        return bool((self.array == c).all(axis=1).any())
+
+def write_frame(leds, frame) -> None:
+    assign = getattr(leds, 'assign', None)
+    if assign is not None:
+        assign(frame)
+    else:
+        leds[:] = recombine_colors(split_colors(frame)).tolist()
+
+def read_frame(leds) -> np.ndarray:
+    arr = getattr(leds, 'array', None)
+    return arr if arr is not None else split_colors(list(leds))
+
 def _rainbow_wheel(p):
     if p < 0 or p > 255:
         r = g = b = 0
@@ -54,10 +196,14 @@ def _rainbow_wheel(p):
         b = int(255 - p * 3)
     return (r, g, b)
 
+_RAINBOW = tuple(_rainbow_wheel(p) for p in range(256))
+_RAINBOW_RGB = np.array(_RAINBOW, dtype=np.uint8)
+
 class rainbow(Sequence, Iterator):
     def __init__(self, count, mod = 0): 
         self._count = count
         self._mod = mod if mod > 0 else count
+        self._step = 256 // self._mod
         self._i = 0
 
     def __iter__(self):
@@ -65,10 +211,16 @@ class rainbow(Sequence, Iterator):
 
     def __next__(self) -> tuple[int, int, int]:
         i, self._i = self._i, (self._i + 1) % self._count
-        return _rainbow_wheel((i * (256 // self._mod)) & 255)
+        return _RAINBOW[(i * self._step) & 255]
 
     def __getitem__(self, idx: int) -> tuple[int, int, int]:
-        return _rainbow_wheel((idx * (256 // self._mod)) & 255)
+        return _RAINBOW[(idx * self._step) & 255]
+
+    def __repr__(self) -> str:
+        return 'rainbow({}, {})'.format(self._count, self._mod)
+
+    def take(self, indices) -> np.ndarray:
+        return _RAINBOW_RGB[(np.asarray(indices) * self._step) & 255]
 
     def __len__(self) -> int:
         return self._count
@@ -0,0 +1,91 @@
+import numpy as np
+
+from .colors import ArrayStripBuffer, write_frame
+
+__all__ = ['Layer', 'Compositor']
+
+_is_resettable = lambda obj: callable(getattr(obj, 'reset', None))
+_can_transition = lambda obj: callable(getattr(obj, 'can_transition', None))
+_has_quality = lambda obj: callable(getattr(obj, 'set_quality', None))
+
+class Layer:
+    NORMAL = 'normal'
+    ADD = 'add'
+    MAX = 'max'
+    MULTIPLY = 'multiply'
+    SCREEN = 'screen'
+
+    MODES = (NORMAL, ADD, MAX, MULTIPLY, SCREEN)
+
+    def __init__(self, effect, opacity: float = 1., mode: str = NORMAL):
+        if mode not in self.MODES:
+            raise ValueError('unknown blend mode {!r}'.format(mode))
+
+        self.effect = effect
+        self.opacity = opacity
+        self.mode = mode
+        self.buffer = None
+
+class Compositor:
+    def __init__(self, layers):
+        self.layers = list(layers)
+        self._n = 0
+
+    def prepare(self, n: int) -> None:
+        if self._n != n:
+            self._allocate(n)
+
+    def _allocate(self, n):
+        self._n = n
+        for layer in self.layers:
+            layer.buffer = ArrayStripBuffer(n)
+        self._acc = np.zeros((n, 3), dtype=np.float32)
+        self._src = np.zeros((n, 3), dtype=np.float32)
+        self._out = np.zeros((n, 3), dtype=np.uint8)
+
+    def reset(self, runner):
+        for layer in self.layers:
+            if _is_resettable(layer.effect):
+                layer.effect.reset(runner)
+
+    def set_quality(self, quality):
+        for layer in self.layers:
+            if _has_quality(layer.effect):
+                layer.effect.set_quality(quality)
+
+    def can_transition(self):
+        return all(layer.effect.can_transition() for layer in self.layers if _can_transition(layer.effect))
+
+    def __call__(self, leds, dt):
+        self.prepare(leds.n)
+
+        acc, src = self._acc, self._src
+        acc.fill(0.)
+        for layer in self.layers:
+            layer.effect(layer.buffer, dt)
+            if layer.opacity <= 0.:
+                continue
+
+            # blend in the 0..255 range, src ends up holding the blended layer
+            np.copyto(src, layer.buffer.array)
+            if layer.mode == Layer.ADD:
+                np.add(src, acc, out=src)
+            elif layer.mode == Layer.MAX:
+                np.maximum(src, acc, out=src)
+            elif layer.mode == Layer.MULTIPLY:
+                np.multiply(src, acc, out=src)
+                src *= 1. / 255.
+            elif layer.mode == Layer.SCREEN:
+                src -= src * acc * (1. / 255.)
+                src += acc
+
+            if layer.opacity >= 1.:
+                np.copyto(acc, src)
+            else:
+                np.subtract(src, acc, out=src)
+                src *= layer.opacity
+                acc += src
+
+        np.clip(acc, 0., 255., out=acc)
+        np.copyto(self._out, acc, casting='unsafe')
+        write_frame(leds, self._out)
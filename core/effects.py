@@ -1,359 +1,454 @@
+from abc import ABC, abstractmethod
 from importlib.abc import FileLoader
+from functools import lru_cache
+from collections import namedtuple
+from inspect import Parameter, signature
+from typing import TYPE_CHECKING, Sequence, Tuple
 import itertools as itt
 import random as rnd
 import math
 import types
 
-from .program import ProgramRunner
-from .utils import *
-
-def color_train(length, gap, count, colors):
-    _cycle = itt.cycle(colors)
-
-    class _():
-        def __init__(self):
-            self.carts = None
-
-        def launch(self, leds):
-            size = length + gap
-            self.striplen = len(leds)
-            self.carts = [x * -size for x in range(count)]
-            self.colors = [next(_cycle) for _ in range(count)]
-
-        def reset(self, _):
-            self.carts = None
-        
-        def can_transition(self):
-           return not self.carts or self.carts[-1] >= self.striplen + length or self.carts[0] <= 0
-
-        def __call__(self, leds, dt):
-            if not self.carts:
-                self.launch(leds)
-
-            leds.fill(0)
-            for cart, color in zip(self.carts, self.colors):
-                if cart >= 0:
-                    for i in range(max(0, cart - length), min(cart, self.striplen)):
-                        leds[i] = color
-
-            for i in range(len(self.carts)):
-                pos = self.carts[i] + 1
-                self.carts[i] = pos 
-
-            if self.carts[-1] > self.striplen + length:
-                self.launch(leds)
-
-    return _()
-
-def rotate(colors, width=1, stop_frames=1):
-    class _():
-        def __init__(self):
-            self._c = colors
-            self._t = 0
-
-        def reset(self, _):
-            self._t = 0
-
-        @classmethod
-        def _fill(cls, leds, colors):
-            it = itt.cycle(colors)
-            c = next(it)
-            n = width
-            for i in range(len(leds)):
-                leds[i] = c
-                n = n - 1
-                if n == 0:
-                    c = next(it)
-                    n = width
-
-        def __call__(self, leds, dt):
-            if self._t <= 0 or stop_frames <= 0:
-                _._fill(leds, self._c)
-                self._c = self._c[1:] + [self._c[0]]
-                self._t = stop_frames
-            else:
-                self._t = self._t - 1
-
-
-    return _()
-
-def breath(colors, speed):
-    _cycle = itt.cycle(colors)
-
-    class _():
-        def __init__(self):
-            self._c = next(_cycle)
-            self._t = 0.
-
-        def can_transition(self):
-            return self._t <= speed 
-
-        def __call__(self, leds, dt):
-            if self._t >= 2.:
-                self._t = 0.
-                self._c = next(_cycle)
-
-            half = (leds.n + 1) >> 1
-            leds[half] = self._c
-
-            for i in range(1, half):
-                inout = lambda t: (t if t < .5 else (1. - t)) * 2.
-
-                width = float(half + 2) * inout(self._t * .5)
-                t = lerp(1., 0., float(i) / width, lambda x: x * x * x) if i < int(width) else 0.
-
-                color = blend(0, self._c, t)
-
-                if half + i < leds.n:
-                    leds[half + i] = color
-
-                if i != 0 and half - i >= 0:
-                    leds[half - i] = color
-            
-            self._t += dt
-
-    return _()
-
-def wave(period, intensity_bounds, speed, colors):
-    _colors = itt.cycle(colors)
-    
-    _mi, _ma = intensity_bounds
-    _amplitude = _ma - _mi;
-    _mod = period * 2 * math.pi
-
-    class _:
-        def __init__(self):
-            self._phase = 0.0
-            self._c = next(_colors)
-
-        def __call__(self, leds, dt):
-            n = len(leds)
-            for i in range(n):
-                x = float(i) / float(n)
-                I = _amplitude * math.sin(_mod * (x + self._phase)) + _mi
-                leds[i] = blend(0, self._c, clamp(I, 0.0, 1.0))
-
-            self._phase = self._phase + (speed * dt)
-
-    return _();
+import numpy as np
 
-def twinkle(background_color, twinkle_colors):
-    _lifetime = 3.
-    _colors = itt.cycle(twinkle_colors)
+from .colors import write_frame
+from .palette import Palette
+from .particles import ParticleSystem
+from .utils import *
 
-    class Spark:
-        def __init__(self):
-            self._t = 0.
-            self._c = next(_colors)
-
-        def tick(self, dt):
-            ratio = self._t / _lifetime
-            ratio = (1. - ratio) if ratio > .5 else ratio
-            self._t += dt
-            return fade(background_color, self._c, ratio / .5)
-
-        def done(self):
-            return self._t >= _lifetime
-
-    class _():
-        def __init__(self):
-            self.reset(None)
-
-        def reset(self, _):
-            self._twinkles = {}
-
-        def __call__(self, leds, dt):
-            leds.fill(background_color);
-
-            fillrate = len(self._twinkles) / len(leds)
-            if rnd.random() > 0.66 and fillrate < 0.75:
-                idx = rnd.randrange(len(leds))
-                while idx in self._twinkles:
-                    idx = rnd.randrange(len(leds))
-                
-                self._twinkles[idx] = Spark()
-
-            rem = []
-            for i, twkl in self._twinkles.items():
-                leds[i] = twkl.tick(dt)
-                if twkl.done():
-                    rem.append(i)
-
-            for i in rem:
-                self._twinkles.pop(i)
-
-    return _()
-
-def firework_rocket(colors, rocket_size = 5):
-    _cycle = itt.cycle(colors)
-    _rocket_speed = 40.
-
-    _particleLifetime = (3., 7.)
-    _particleVelocity = (20., 90.)
-    _particleCount = (4, 12)
-
-    def _decay(value, threshold = .5):
-        rate = rnd.random()
-        if rate <= threshold:
-            return lerp(value, 0., rate)
-        return value
-
-    class _rocket:
-        def __init__(self, trail_size):
-            self._t = 0.
-            self._front = 0
-            self._target = trail_size + rocket_size
-            pass
-
-        def tick(self, trail, dt):
-            sz = len(trail)
-            self._t += dt
-            self._front = int(self._t * _rocket_speed)
-
-            l = clamp(self._front - rocket_size, 0, sz + 1)
-            h = clamp(self._front, 0, sz)
-
-            if h > l:
-                trail[l:h] = [1.] * (h - l)
-            
-        def done(self):
-            return self._front >= self._target
-
-    class _particle:
-        def __init__(self):
+if TYPE_CHECKING:
+    from .program import ProgramRunner
+
+Color = int
+Colors = Sequence[int]
+
+Param = namedtuple('Param', 'name type default')
+REQUIRED = Parameter.empty
+
+# effect name -> class, in definition order
+EFFECTS = {}
+
+def register(cls):
+    # parameters are declared by the annotated __init__ signature
+    cls.params = tuple(
+        Param(p.name, None if p.annotation is Parameter.empty else p.annotation, p.default)
+        for p in signature(cls.__init__).parameters.values() if p.name != 'self')
+    EFFECTS[cls.name] = cls
+    return cls
+
+# Effects are called once per frame with the strip and the frame time.
+# Optional hooks, looked up with getattr by programs and compositors:
+#   reset(runner), can_transition(), period(n, dt), set_quality(quality)
+class Effect(ABC):
+    __slots__ = ()
+    name = None
+    params = ()
+
+    @classmethod
+    def example(cls, n: int) -> tuple:
+        # arguments the visualizer and benchmarks use to show this effect
+        return ()
+
+    @abstractmethod
+    def __call__(self, leds, dt: float) -> None:
+        pass
+
+    def __repr__(self):
+        return '<{} effect>'.format(self.name)
+
+_SINE_SIZE = 4096
+_SINE = np.sin(np.arange(_SINE_SIZE) * (2. * math.pi / _SINE_SIZE))
+
+def _readonly(arr):
+    arr.setflags(write=False)
+    return arr
+
+@lru_cache(maxsize=32)
+def _breath_profile(n):
+    # distance of each LED to the center, and its cube for the falloff
+    d = np.abs(np.arange(n) - ((n + 1) >> 1))
+    return _readonly(d), _readonly((d ** 3).astype(np.float32))
+
+@lru_cache(maxsize=32)
+def _wave_profile(n, period):
+    # sine table position of each LED at phase 0
+    return _readonly(np.arange(n) * (period * _SINE_SIZE / n))
+
+@lru_cache(maxsize=32)
+def _wave_colors(color, low, high):
+    # one shaded color per sine table entry
+    return _readonly(blend_frame(0, color, (high - low) * _SINE + low))
+
+@register
+class ColorTrain(Effect):
+    name = 'color_train'
+    __slots__ = ('_length', '_gap', '_count', '_cycle', 'carts', 'colors', 'striplen')
+
+    def __init__(self, length: int, gap: int, count: int, colors: Colors):
+        self._length = length
+        self._gap = gap
+        self._count = count
+        self._cycle = itt.cycle(colors)
+        self.carts = None
+
+    @classmethod
+    def example(cls, n):
+        return (3, 2, n - 10, Palette.rainbow(20, n - 10))
+
+    def launch(self, leds):
+        size = self._length + self._gap
+        self.striplen = len(leds)
+        self.carts = [x * -size for x in range(self._count)]
+        self.colors = [next(self._cycle) for _ in range(self._count)]
+
+    def reset(self, _):
+        self.carts = None
+
+    def can_transition(self):
+       return not self.carts or self.carts[-1] >= self.striplen + self._length or self.carts[0] <= 0
+
+    def __call__(self, leds, dt):
+        if not self.carts:
+            self.launch(leds)
+
+        length = self._length
+        leds.fill(0)
+        for cart, color in zip(self.carts, self.colors):
+            if cart >= 0:
+                for i in range(max(0, cart - length), min(cart, self.striplen)):
+                    leds[i] = color
+
+        for i in range(len(self.carts)):
+            pos = self.carts[i] + 1
+            self.carts[i] = pos 
+
+        if self.carts[-1] > self.striplen + length:
+            self.launch(leds)
+
+@register
+class Rotate(Effect):
+    name = 'rotate'
+    __slots__ = ('_width', '_stop_frames', '_colors', '_c', '_t')
+
+    def __init__(self, colors: Colors, width: int = 1, stop_frames: int = 1):
+        self._colors = colors
+        self._width = width
+        self._stop_frames = stop_frames
+        self._c = colors
+        self._t = 0
+
+    @classmethod
+    def example(cls, n):
+        return ([0x30aa00, 0xbf1500, 0x4b0f6e, 0x000000], 3, 3)
+
+    def reset(self, _):
+        self._t = 0
+
+    def period(self, n, dt):
+        return len(self._colors) * (max(self._stop_frames, 0) + 1)
+
+    def _fill(self, leds, colors):
+        it = itt.cycle(colors)
+        c = next(it)
+        n = self._width
+        for i in range(len(leds)):
+            leds[i] = c
+            n = n - 1
+            if n == 0:
+                c = next(it)
+                n = self._width
+
+    def __call__(self, leds, dt):
+        if self._t <= 0 or self._stop_frames <= 0:
+            self._fill(leds, self._c)
+            self._c = self._c[1:] + [self._c[0]]
+            self._t = self._stop_frames
+        else:
+            self._t = self._t - 1
+
+def _inout(t):
+    return (t if t < .5 else (1. - t)) * 2.
+
+@register
+class Breath(Effect):
+    name = 'breath'
+    __slots__ = ('_speed', '_cycle', '_c', '_t')
+
+    def __init__(self, colors: Colors, speed: float):
+        self._speed = speed
+        self._cycle = itt.cycle(colors)
+        self._c = next(self._cycle)
+        self._t = 0.
+
+    @classmethod
+    def example(cls, n):
+        return ([0xff0000, 0x00ff00, 0x0000ff], .025)
+
+    def can_transition(self):
+        return self._t <= self._speed
+
+    def __call__(self, leds, dt):
+        if self._t >= 2.:
             self._t = 0.
-            self._lifetime = rnd.uniform(*_particleLifetime)
-            self._velocity = rnd.uniform(*_particleVelocity)
-            self._pos = 0.
-
-        def tick(self, trail, dt):
-            self._t += dt
-            self._pos += self._velocity * dt
-            self._velocity -= 0.5 * self._velocity * dt
-
-            ease = lambda x: x * x * x
-
-            idx = int(math.floor(self._pos))
-            if 0 < idx <= len(trail):
-                trail[-idx] = 1. * (1. - ease(self._t / self._lifetime))
-
-            if idx > len(trail):
-                self._t = self._lifetime
-            pass
-
-        def done(self):
-            return self._t >= self._lifetime
-
-    class _:
-        def __init__(self):
-            self._rocket = None
-            self._particles = None
-            self._trail = None
-
-        def reset(self, runner: ProgramRunner):
-            if runner:
-                self._trail = [0.] * runner.strip.n
-
-            self._rocket = _rocket(len(self._trail))
-            self._particles = None
-            self._c = next(_cycle)
-            self._dir = 1 if rnd.randint(0, 1) == 0 else -1
-
-
-        def can_transition(self):
-            return self._rocket == self._explosion == None
-
-        def __call__(self, leds, dt):
-            #trail decay
-            self._trail[:] = [_decay(x, .5) for x in self._trail]
-
-            if not self._rocket.done():
-                self._rocket.tick(self._trail, dt)
-
-                if self._rocket.done():
-                    self._particles = [_particle() for x in range(rnd.randint(*_particleCount))]
-
-            if self._particles:
-                fully_done = True
-                for p in self._particles:
-                    done = p.done()
-                    fully_done = fully_done if done else False
-                    if not done:
-                        p.tick(self._trail, dt)
-
-                if fully_done:
-                    self.reset(None)
-                    self._trail = [0.] * leds.n
-                    leds.fill(0)
-                    return
-
-            it = iter(self._trail)
-            for i in range(0, leds.n)[::self._dir]:
-                leds[i] = blend(0, self._c, next(it))
-                
-    return _()
-
-def firework_explosion(colors, max_ratio = .90):
-    _particleLifetime = (2., 6.)
-    _particleVelocity = (3., 15.)
-    _particleCount = (4, 12)
-
-    class _particle:
-        def __init__(self, color, pos, vel):
-            self._c = color
-            self._t = 0.
-            self._lifetime = rnd.uniform(*_particleLifetime)
-            self._velocity = vel 
-            self._pos = float(pos)
-
-        _ease = lambda x: x * x * x
-
-        def tick(self, leds, dt):
-            self._pos += self._velocity * dt
-            self._velocity -= 0.5 * self._velocity * dt
-
-            idx = int(math.floor(self._pos))
-            if 0 < idx < len(leds):
-                fade_ratio = self._t / self._lifetime
-                leds[idx] = blend_max(leds[idx], blend(self._c, 0, fade_ratio, _particle._ease))
-            else:
-                self._t = self._lifetime
-
-            self._t += dt
-
-        def done(self):
-            return self._t >= self._lifetime
-
-
-    class _:
-        def __init__(self):
-            self._particles = []
-            pass
-
-        def reset(self, runner: ProgramRunner):
-            self._particles = []
-
-        def __call__(self, leds, dt):
-            strip = [0] * leds.n
-
-            if (float(len(self._particles)) / leds.n) < max_ratio:
-                if rnd.random() < .3:
-                    center = rnd.randint(5, leds.n - 5)
-                    count = rnd.randint(*_particleCount)
-
-                    for i in range(count):
-                        c = rnd.choice(colors)
-                        vel = rnd.uniform(*_particleVelocity)
-                        self._particles += [ _particle(c, center, vel), _particle(c, center, -vel) ]
-                    pass
-
-            for p in self._particles:
-                p.tick(strip, dt)
-
-            self._particles = [p for p in self._particles if not p.done()]
-
-            leds[:] = strip[:]
-
-    return _()
+            self._c = next(self._cycle)
 
+        half = (leds.n + 1) >> 1
+        width = max(float(half + 2) * _inout(self._t * .5), 1.)
 
+        d, d3 = _breath_profile(leds.n)
+        t = np.where(d < int(width), 1. - d3 / (width * width * width), 0.)
+        write_frame(leds, blend_frame(0, self._c, t))
+        
+        self._t += dt
+
+@register
+class Wave(Effect):
+    name = 'wave'
+    __slots__ = ('_period', '_low', '_high', '_speed', '_cycle', '_phase', '_c')
+
+    def __init__(self, period: float, intensity_bounds: Tuple[float, float], speed: float, colors: Colors):
+        self._period = period
+        self._low, self._high = intensity_bounds
+        self._speed = speed
+        self._cycle = itt.cycle(colors)
+        self._phase = 0.0
+        self._c = next(self._cycle)
+
+    @classmethod
+    def example(cls, n):
+        return (1.2, (0.5, 1.0), .7, [0x6611cc])
+
+    def period(self, n, dt):
+        # only a whole number of frames loops without a seam
+        frames = 1. / (self._period * self._speed * dt)
+        return max(1, round(frames)) if abs(frames - round(frames)) < 1e-6 else None
+
+    def __call__(self, leds, dt):
+        offset = (self._period * self._phase) % 1. * _SINE_SIZE
+        idx = (_wave_profile(len(leds), self._period) + offset).astype(np.intp) & (_SINE_SIZE - 1)
+        write_frame(leds, _wave_colors(self._c, self._low, self._high)[idx])
+
+        self._phase = self._phase + (self._speed * dt)
+
+@register
+class Twinkle(Effect):
+    name = 'twinkle'
+    __slots__ = ('_colors', '_background', '_n', '_t', '_c', '_free', '_nfree', '_frame')
+
+    LIFETIME = 3.
+
+    def __init__(self, background_color: Color, twinkle_colors: Colors):
+        self._colors = itt.cycle(twinkle_colors)
+        self._background = split_colors(background_color).reshape(1, 3)
+        self._n = 0
+
+    @classmethod
+    def example(cls, n):
+        return (0x909090, [0xffffff])
+
+    def reset(self, _):
+        if self._n:
+            self._allocate(self._n)
+
+    def _allocate(self, n):
+        self._n = n
+        self._t = np.full(n, -1., dtype=np.float32)
+        self._c = np.zeros((n, 3), dtype=np.uint8)
+        self._free = np.arange(n)
+        self._nfree = n
+        self._frame = np.empty((n, 3), dtype=np.uint8)
+
+    def _spawn(self):
+        # swap-remove a random slot from the free pool
+        k = rnd.randrange(self._nfree)
+        idx = self._free[k]
+        self._nfree -= 1
+        self._free[k] = self._free[self._nfree]
+
+        self._t[idx] = 0.
+        self._c[idx] = split_color(next(self._colors))
+
+    def __call__(self, leds, dt):
+        if self._n != leds.n:
+            self._allocate(leds.n)
+
+        fillrate = (self._n - self._nfree) / self._n
+        if rnd.random() > 0.66 and fillrate < 0.75:
+            self._spawn()
+
+        self._frame[:] = self._background
+        active = np.flatnonzero(self._t >= 0.)
+        if len(active):
+            ratio = self._t[active] / self.LIFETIME
+            ratio = np.where(ratio > .5, 1. - ratio, ratio)
+            self._frame[active] = fade_frame(self._background, self._c[active], ratio / .5)
+
+            self._t[active] += dt
+            done = active[self._t[active] >= self.LIFETIME]
+            self._t[done] = -1.
+            self._free[self._nfree:self._nfree + len(done)] = done
+            self._nfree += len(done)
+
+        write_frame(leds, self._frame)
+
+def _decay(trail, threshold = .5):
+    rate = np.random.random(len(trail)).astype(np.float32)
+    trail *= np.where(rate <= threshold, 1. - rate, 1.)
+
+class _Rocket:
+    __slots__ = ('_t', '_front', '_size', '_target')
+
+    SPEED = 40.
+
+    def __init__(self, trail_size, rocket_size):
+        self._t = 0.
+        self._front = 0
+        self._size = rocket_size
+        self._target = trail_size + rocket_size
+
+    def tick(self, trail, dt):
+        sz = len(trail)
+        self._t += dt
+        self._front = int(self._t * self.SPEED)
+
+        l = clamp(self._front - self._size, 0, sz + 1)
+        h = clamp(self._front, 0, sz)
+
+        if h > l:
+            trail[l:h] = 1.
+        
+    def done(self):
+        return self._front >= self._target
+
+@register
+class FireworkRocket(Effect):
+    name = 'firework_rocket'
+    __slots__ = ('_cycle', '_rocket_size', '_rocket', '_particles', '_exploded', '_trail', '_quality', '_c', '_dir')
+
+    PARTICLE_LIFETIME = (3., 7.)
+    PARTICLE_VELOCITY = (20., 90.)
+    PARTICLE_COUNT = (4, 12)
+
+    def __init__(self, colors: Colors, rocket_size: int = 5):
+        self._cycle = itt.cycle(colors)
+        self._rocket_size = rocket_size
+        self._rocket = None
+        self._particles = ParticleSystem(self.PARTICLE_COUNT[1])
+        self._exploded = False
+        self._trail = None
+        self._quality = 1.
+
+    @classmethod
+    def example(cls, n):
+        return ([0x12ff34, 0xff3412, 0x1234ff], 5)
+
+    def set_quality(self, quality):
+        self._quality = quality.particles
+
+    def reset(self, runner: 'ProgramRunner'):
+        if runner:
+            self._trail = np.zeros(runner.strip.n, dtype=np.float32)
+
+        self._rocket = _Rocket(len(self._trail), self._rocket_size)
+        self._particles.clear()
+        self._exploded = False
+        self._c = next(self._cycle)
+        self._dir = 1 if rnd.randint(0, 1) == 0 else -1
+
+
+    def can_transition(self):
+        return not self._exploded and self._particles.count == 0
+
+    def __call__(self, leds, dt):
+        _decay(self._trail, .5)
+
+        if not self._rocket.done():
+            self._rocket.tick(self._trail, dt)
+
+            if self._rocket.done():
+                # particles fall back from the far end of the trail
+                count = max(1, round(rnd.randint(*self.PARTICLE_COUNT) * self._quality))
+                self._particles.spawn(count, len(self._trail),
+                    -np.random.uniform(*self.PARTICLE_VELOCITY, count),
+                    np.random.uniform(*self.PARTICLE_LIFETIME, count))
+                self._exploded = True
+
+        if self._exploded:
+            if self._particles.count == 0:
+                self.reset(None)
+                self._trail[:] = 0.
+                leds.fill(0)
+                return
+
+            p = self._particles
+            p.integrate(dt, .5)
+            p.kill(p.index() < 0)
+            p.advance(dt)
+            p.splat(self._trail, cubic, ParticleSystem.SET)
+
+        write_frame(leds, blend_frame(0, self._c, self._trail)[::self._dir])
+
+@register
+class FireworkExplosion(Effect):
+    name = 'firework_explosion'
+    __slots__ = ('_palette', '_max_ratio', '_particles', '_frame', '_quality')
+
+    PARTICLE_LIFETIME = (2., 6.)
+    PARTICLE_VELOCITY = (3., 15.)
+    PARTICLE_COUNT = (4, 12)
+
+    def __init__(self, colors: Colors, max_ratio: float = .90):
+        self._palette = Palette([colors[i] for i in range(len(colors))])
+        self._max_ratio = max_ratio
+        self._particles = None
+        self._frame = None
+        self._quality = 1.
+
+    @classmethod
+    def example(cls, n):
+        return ([0x12ff34, 0xff3412, 0x1234ff],)
+
+    def set_quality(self, quality):
+        self._quality = quality.particles
+
+    def reset(self, runner: 'ProgramRunner'):
+        if self._particles:
+            self._particles.clear()
+
+    def _allocate(self, n):
+        self._particles = ParticleSystem(int(n * self._max_ratio) + 2 * self.PARTICLE_COUNT[1])
+        self._frame = np.zeros((n, 3), dtype=np.uint8)
+
+    def __call__(self, leds, dt):
+        if self._frame is None or len(self._frame) != leds.n:
+            self._allocate(leds.n)
+
+        p = self._particles
+        if (float(p.count) / leds.n) < self._max_ratio * self._quality:
+            if rnd.random() < .3 * self._quality:
+                center = rnd.randint(5, leds.n - 5)
+                count = max(1, round(rnd.randint(*self.PARTICLE_COUNT) * self._quality))
+
+                c = self._palette.take(np.random.randint(len(self._palette), size=count))
+                vel = np.random.uniform(*self.PARTICLE_VELOCITY, count)
+                p.spawn(2 * count, center, np.concatenate((vel, -vel)),
+                    np.random.uniform(*self.PARTICLE_LIFETIME, 2 * count), np.concatenate((c, c)))
+
+        p.integrate(dt, .5)
+        idx = p.index()
+        p.kill((idx <= 0) | (idx >= leds.n))
+
+        self._frame.fill(0)
+        p.splat(self._frame, cubic, ParticleSystem.MAX)
+        p.advance(dt)
+
+        write_frame(leds, self._frame)
+
+# the lowercase factory names programs have always used
+color_train = ColorTrain
+rotate = Rotate
+breath = Breath
+wave = Wave
+twinkle = Twinkle
+firework_rocket = FireworkRocket
+firework_explosion = FireworkExplosion
@@ -0,0 +1,76 @@
+from collections import namedtuple
+
+__all__ = ['Quality', 'Governor', 'QUALITY_LEVELS']
+
+# transition scales the crossfade length (0 cuts straight to the next
+# effect), particles scales how many particles effects spawn
+Quality = namedtuple('Quality', 'level fps transition particles')
+
+QUALITY_LEVELS = (
+    Quality(0, 24., 1., 1.),
+    Quality(1, 24., .5, .75),
+    Quality(2, 20., .5, .5),
+    Quality(3, 15., 0., .35),
+    Quality(4, 12., 0., .2),
+)
+
+class Governor:
+    def __init__(self, scheduler, targets, levels = QUALITY_LEVELS, high: float = .85, low: float = .5,
+                 patience: int = 24, recovery: int = 120, smoothing: float = .1, on_change = None):
+        self._scheduler = scheduler
+        self._targets = targets
+        self._on_change = on_change
+        self.levels = levels
+        self.high = high
+        self.low = low
+        self.patience = patience
+        self.recovery = recovery
+        self.smoothing = smoothing
+        self.level = 0
+        self.changes = 0
+        self.load = 0.
+        self._cost = None
+        self._over = 0
+        self._under = 0
+
+    @property
+    def quality(self) -> Quality:
+        return self.levels[self.level]
+
+    def observe(self, render_time: float) -> None:
+        # smoothed render cost, compared against the period of the current level and the one above it
+        if self._cost is None:
+            self._cost = render_time
+        else:
+            self._cost += (render_time - self._cost) * self.smoothing
+        self.load = self._cost * self.quality.fps
+
+        if self.load > self.high:
+            self._over += 1
+            self._under = 0
+            if self._over >= self.patience and self.level + 1 < len(self.levels):
+                self._set_level(self.level + 1)
+        elif self.level > 0 and self._cost * self.levels[self.level - 1].fps < self.low:
+            self._under += 1
+            self._over = 0
+            if self._under >= self.recovery:
+                self._set_level(self.level - 1)
+        else:
+            self._over = 0
+            self._under = 0
+
+    def _set_level(self, level: int) -> None:
+        previous, self.level = self.quality, level
+        self._over = 0
+        self._under = 0
+        self.changes += 1
+        self.apply()
+        print('Governor: quality {} -> {} at {:.0%} load ({:.1f} ms per frame): {}'.format(
+            previous.level, level, self.load, self._cost * 1000., self.quality))
+
+    def apply(self) -> None:
+        quality = self.quality
+        self._scheduler.set_fps(quality.fps)
+        self._targets.set_quality(quality)
+        if self._on_change is not None:
+            self._on_change(quality)
@@ -0,0 +1,235 @@
+import os
+import socketserver
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+__all__ = ['Registry', 'Counter', 'Gauge', 'Histogram', 'RunnerMetrics', 'MetricsServer', 'effect_name', 'REGISTRY']
+
+DEFAULT_BUCKETS = (.0001, .00025, .0005, .001, .0025, .005, .01, .025, .05, .1, .25)
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _labels(names, values, extra = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join('{}="{}"'.format(k, _escape(str(v))) for k, v in pairs) + '}'
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+# Children are updated without locks: every runner owns its labelled
+# children, so each one only ever has a single writer.
+class _Value:
+    __slots__ = ('value', '_fn')
+
+    def __init__(self):
+        self.value = 0.
+        self._fn = None
+
+    def inc(self, amount: float = 1.) -> None:
+        self.value += amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def set_function(self, fn) -> None:
+        self._fn = fn
+
+    def samples(self, name: str, labels: str):
+        yield '{}{} {}'.format(name, labels, _number(self._fn() if self._fn is not None else self.value))
+
+class _Buckets:
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def samples(self, name: str, labels: str):
+        base = labels[1:-1] + ',' if labels else ''
+        total = 0
+        for bound, count in zip(self.bounds + (float('inf'),), list(self.counts)):
+            total += count
+            yield '{}_bucket{{{}le="{}"}} {}'.format(name, base, _number(bound), total)
+        yield '{}_sum{} {}'.format(name, labels, _number(self.sum))
+        yield '{}_count{} {}'.format(name, labels, total)
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name: str, help: str, labelnames = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def _child(self):
+        return _Value()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._child())
+        return child
+
+    def render(self):
+        yield '# HELP {} {}'.format(self.name, self.help)
+        yield '# TYPE {} {}'.format(self.name, self.kind)
+        for values, child in list(self._children.items()):
+            yield from child.samples(self.name, _labels(self.labelnames, values))
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.) -> None:
+        self.labels().inc(amount)
+
+    def set_function(self, fn) -> None:
+        self.labels().set_function(fn)
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames = (), buckets = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _child(self):
+        return _Buckets(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError('metric {} is already registered as a {}'.format(name, metric.kind))
+            return metric
+
+    def counter(self, name: str, help: str, labelnames = ()) -> Counter:
+        return self._register(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames = ()) -> Gauge:
+        return self._register(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames = (), buckets = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help, labelnames, buckets)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+
+def effect_name(fx) -> str:
+    name = getattr(fx, 'name', None)
+    if isinstance(name, str):
+        return name
+    return type(fx).__name__
+
+class RunnerMetrics:
+    def __init__(self, segment: str, registry: Registry = REGISTRY):
+        self.segment = segment
+        self._render = registry.histogram('leds_program_render_seconds', 'Time spent rendering one frame of a program.', ('segment', 'program'))
+        self._effect = registry.histogram('leds_effect_render_seconds', 'Time spent rendering one frame of an effect.', ('segment', 'effect'))
+        self._transitions = registry.counter('leds_transitions_total', 'Effect transitions started.', ('segment', 'program'))
+        self.transmit = registry.histogram('leds_transmit_seconds', 'Time spent handing a frame to the output.', ('segment',)).labels(segment)
+        frames = registry.counter('leds_frames_total', 'Rendered frames by outcome.', ('segment', 'outcome'))
+        self.transmitted = frames.labels(segment, 'transmitted')
+        self.skipped = frames.labels(segment, 'unchanged')
+        self._programs = {}
+        self._effects = {}
+
+    def program(self, program):
+        child = self._programs.get(type(program))
+        if child is None:
+            child = self._programs[type(program)] = self._render.labels(self.segment, type(program).__name__)
+        return child
+
+    def effect(self, fx):
+        # effects are rebuilt on every program start, so key by the label rather than the instance
+        name = effect_name(fx)
+        child = self._effects.get(name)
+        if child is None:
+            child = self._effects[name] = self._effect.labels(self.segment, name)
+        return child
+
+    def transition(self, program) -> None:
+        self._transitions.labels(self.segment, type(program).__name__).inc()
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+
+        body = self.server.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        pass
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class MetricsServer:
+    def __init__(self, registry: Registry = REGISTRY, port: int = 9108, host: str = '127.0.0.1', path: str = None):
+        self._path = path
+        if path is not None:
+            if os.path.exists(path):
+                os.unlink(path)
+            self._server = _UnixHTTPServer(path, _Handler)
+        else:
+            self._server = ThreadingHTTPServer((host, port), _Handler)
+            self._server.daemon_threads = True
+        self._server.registry = registry
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics', daemon=True)
+
+    @property
+    def address(self):
+        return self._path if self._path is not None else self._server.server_address
+
+    def start(self) -> 'MetricsServer':
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._path is not None and os.path.exists(self._path):
+            os.unlink(self._path)
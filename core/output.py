@@ -0,0 +1,158 @@
+import queue
+import threading
+
+import numpy as np
+
+from .colors import ArrayStripBuffer, WireStripBuffer, read_frame, write_frame
+
+__all__ = ['ColorCorrection', 'Output', 'PipelinedOutput']
+
+_OFFSETS = np.array([0, 256, 512], dtype=np.uint16)
+
+def _per_channel(value) -> tuple:
+    return tuple(value) if isinstance(value, (tuple, list)) else (value,) * 3
+
+class ColorCorrection:
+    def __init__(self, gamma = 1., white_balance = (1., 1., 1.), brightness: float = 1.):
+        self._gamma = _per_channel(gamma)
+        self._white_balance = _per_channel(white_balance)
+        self._brightness = brightness
+        self._idx = None
+        self._build()
+
+    @property
+    def gamma(self) -> tuple:
+        return self._gamma
+
+    @gamma.setter
+    def gamma(self, value) -> None:
+        self._gamma = _per_channel(value)
+        self._build()
+
+    @property
+    def white_balance(self) -> tuple:
+        return self._white_balance
+
+    @white_balance.setter
+    def white_balance(self, value) -> None:
+        self._white_balance = _per_channel(value)
+        self._build()
+
+    @property
+    def brightness(self) -> float:
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, value: float) -> None:
+        self._brightness = value
+        self._build()
+
+    @property
+    def lut(self) -> np.ndarray:
+        return self._lut.reshape(3, 256)
+
+    def _build(self) -> None:
+        x = np.arange(256) / 255.
+        lut = [np.power(x, g) * (255. * w * self._brightness) for g, w in zip(self._gamma, self._white_balance)]
+        self._lut = np.clip(np.rint(np.concatenate(lut)), 0, 255).astype(np.uint8)
+
+    def __call__(self, frame: np.ndarray, out: np.ndarray = None, channels: np.ndarray = None) -> np.ndarray:
+        if self._idx is None or self._idx.shape != frame.shape:
+            self._idx = np.empty(frame.shape, dtype=np.uint16)
+
+        if channels is None:
+            np.add(frame, _OFFSETS, out=self._idx)
+        else:
+            # reorder the channels into the output's byte order on the way
+            np.add(frame[:, channels], _OFFSETS[channels], out=self._idx)
+        return np.take(self._lut, self._idx, out=out)
+
+class Output:
+    def __init__(self, device, correction: ColorCorrection = None):
+        self.device = device
+        self.correction = correction
+        self._frame = None
+        self._wire = WireStripBuffer.adopt(device)
+
+    @property
+    def zero_copy(self) -> bool:
+        return self._wire is not None
+
+    def present(self, strip) -> None:
+        frame = read_frame(strip)
+        if self._wire is not None:
+            if self.correction is not None:
+                self.correction(frame, out=self._wire.wire, channels=self._wire.channels)
+            else:
+                self._wire.assign(frame)
+            self._wire.show()
+            return
+
+        if self.correction is not None:
+            if self._frame is None or self._frame.shape != frame.shape:
+                self._frame = np.empty(frame.shape, dtype=np.uint8)
+            frame = self.correction(frame, out=self._frame)
+
+        write_frame(self.device, frame)
+        self.device.show()
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+class PipelinedOutput(Output):
+    def __init__(self, device, correction: ColorCorrection = None, depth: int = 2):
+        super().__init__(device, correction)
+        self._free = queue.Queue()
+        self._ready = queue.Queue()
+        for _ in range(max(depth, 2)):
+            self._free.put(self._wire.clone() if self._wire is not None else ArrayStripBuffer(len(device)))
+
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name='led-output', daemon=True)
+        self._thread.start()
+
+    def present(self, strip) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+        # blocks while every buffer is queued or being sent
+        buf = self._free.get()
+
+        frame = read_frame(strip)
+        if self._wire is not None and self.correction is not None:
+            self.correction(frame, out=buf.wire, channels=buf.channels)
+        elif self.correction is not None:
+            self.correction(frame, out=buf.array)
+        else:
+            buf.assign(frame)
+
+        self._ready.put(buf)
+
+    def _run(self) -> None:
+        while True:
+            buf = self._ready.get()
+            try:
+                if buf is None:
+                    return
+                if self._wire is not None:
+                    buf.attach(self.device)
+                else:
+                    write_frame(self.device, buf.array)
+                self.device.show()
+            except Exception as e:
+                self._error = e
+            finally:
+                if buf is not None:
+                    self._free.put(buf)
+                self._ready.task_done()
+
+    def flush(self) -> None:
+        self._ready.join()
+
+    def close(self) -> None:
+        self._ready.put(None)
+        self._thread.join()
@@ -0,0 +1,89 @@
+import math
+from collections.abc import Sequence
+
+import numpy as np
+
+from .colors import _rainbow_wheel
+from .utils import split_colors, recombine_colors
+
+__all__ = ['Palette']
+
+class Palette(Sequence):
+    SIZE = 256
+
+    def __init__(self, table, cyclic: bool = False):
+        self._rgb = np.ascontiguousarray(split_colors(table).reshape(-1, 3))
+        self._rgb.setflags(write=False)
+        self._packed = recombine_colors(self._rgb)
+        self._ints = self._packed.tolist()
+        self._rows = [tuple(c) for c in self._rgb.tolist()]
+        self._n = len(self._ints)
+        self.cyclic = cyclic
+
+    @classmethod
+    def from_colors(cls, colors, size: int = None, cyclic: bool = False) -> 'Palette':
+        rgb = split_colors(colors)
+        size = size or len(rgb)
+        return cls(rgb[np.arange(size) * len(rgb) // size], cyclic)
+
+    @classmethod
+    def gradient(cls, colors, positions=None, size: int = SIZE, cyclic: bool = False) -> 'Palette':
+        stops = split_colors(colors).astype(np.float32)
+        if positions is None:
+            if cyclic:
+                stops = np.concatenate((stops, stops[:1]))
+            positions = np.linspace(0., 1., len(stops))
+        elif cyclic:
+            stops = np.concatenate((stops, stops[:1]))
+            positions = list(positions) + [1.]
+
+        x = np.arange(size) / (size if cyclic else max(size - 1, 1))
+        rgb = np.stack([np.interp(x, positions, stops[:, ch]) for ch in range(3)], axis=-1)
+        return cls(np.rint(rgb).astype(np.uint8), cyclic)
+
+    @classmethod
+    def rainbow(cls, size: int = SIZE, count: int = None) -> 'Palette':
+        # count entries stepping around a wheel of size hues, one per item for effects that cycle through them
+        return cls([_rainbow_wheel(p % size * 256 // size) for p in range(count or size)], cyclic=True)
+
+    @property
+    def rgb(self) -> np.ndarray:
+        return self._rgb
+
+    @property
+    def packed(self) -> np.ndarray:
+        return self._packed
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __repr__(self) -> str:
+        return 'Palette([{}], cyclic={})'.format(', '.join('0x{:06x}'.format(c) for c in self._ints), self.cyclic)
+
+    def __iter__(self):
+        return iter(self._ints)
+
+    def __getitem__(self, idx: int) -> int:
+        return self._ints[idx % self._n]
+
+    def take(self, indices) -> np.ndarray:
+        return self._rgb[np.asarray(indices) % self._n]
+
+    def sample(self, f: float) -> int:
+        x = f * self._n if self.cyclic else min(max(f, 0.), 1.) * (self._n - 1)
+        i = math.floor(x)
+        t = x - i
+        i0 = i % self._n
+        i1 = (i0 + 1) % self._n if self.cyclic else min(i0 + 1, self._n - 1)
+        a, b = self._rows[i0], self._rows[i1]
+        s = 1. - t
+        return int(a[0] * s + b[0] * t) << 16 | int(a[1] * s + b[1] * t) << 8 | int(a[2] * s + b[2] * t)
+
+    def sample_n(self, f) -> np.ndarray:
+        f = np.asarray(f, dtype=np.float32)
+        x = f * self._n if self.cyclic else np.clip(f, 0., 1.) * (self._n - 1)
+        i = np.floor(x)
+        t = (x - i)[..., np.newaxis]
+        i0 = i.astype(np.intp) % self._n
+        i1 = (i0 + 1) % self._n if self.cyclic else np.minimum(i0 + 1, self._n - 1)
+        return (self._rgb[i0] * (1. - t) + self._rgb[i1] * t).astype(np.uint8)
@@ -0,0 +1,85 @@
+import numpy as np
+
+__all__ = ['ParticleSystem']
+
+def _head(value, count: int, ndim: int = 1):
+    value = np.asarray(value)
+    return value[:count] if value.ndim >= ndim else value
+
+class ParticleSystem:
+    MAX = 'max'
+    SET = 'set'
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.pos = np.zeros(capacity, dtype=np.float32)
+        self.vel = np.zeros(capacity, dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.ones(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self._free = np.arange(capacity)[::-1].copy()
+        self._nfree = capacity
+
+    @property
+    def count(self) -> int:
+        return self.capacity - self._nfree
+
+    def clear(self) -> None:
+        self.alive[:] = False
+        self._free[:] = np.arange(self.capacity)[::-1]
+        self._nfree = self.capacity
+
+    def spawn(self, count: int, pos, vel, lifetime, color = 0) -> np.ndarray:
+        requested, count = count, min(count, self._nfree)
+        if count < requested:
+            # per particle arguments were sized for the request, keep the ones that fit
+            pos, vel, lifetime = _head(pos, count), _head(vel, count), _head(lifetime, count)
+            color = _head(color, count, 2)
+        self._nfree -= count
+        idx = self._free[self._nfree:self._nfree + count]
+
+        self.pos[idx] = pos
+        self.vel[idx] = vel
+        self.age[idx] = 0.
+        self.lifetime[idx] = lifetime
+        self.color[idx] = color
+        self.alive[idx] = True
+        return idx
+
+    def kill(self, mask: np.ndarray) -> None:
+        idx = np.flatnonzero(mask & self.alive)
+        self.alive[idx] = False
+        self._free[self._nfree:self._nfree + len(idx)] = idx
+        self._nfree += len(idx)
+
+    def index(self) -> np.ndarray:
+        return np.floor(self.pos).astype(np.intp)
+
+    def integrate(self, dt: float, drag: float = 0.) -> None:
+        self.pos += self.vel * dt
+        self.vel -= drag * self.vel * dt
+
+    def advance(self, dt: float) -> None:
+        self.age += dt
+        self.kill(self.age >= self.lifetime)
+
+    def intensity(self, ease = None) -> np.ndarray:
+        t = np.clip(self.age / self.lifetime, 0., 1.)
+        return 1. - (t if ease is None else ease(t))
+
+    def splat(self, target: np.ndarray, ease = None, mode: str = MAX) -> None:
+        idx = self.index()
+        live = self.alive & (idx >= 0) & (idx < len(target))
+        i = idx[live]
+        w = self.intensity(ease)[live]
+
+        if target.ndim == 1:
+            values = w.astype(target.dtype)
+        else:
+            values = (self.color[live] * w[:, np.newaxis]).astype(target.dtype)
+
+        if mode == self.MAX:
+            np.maximum.at(target, i, values)
+        else:
+            target[i] = values
@@ -1,10 +1,13 @@
 from abc import abstractclassmethod
 import datetime as dt
+from time import perf_counter
 from typing import Tuple, List
 
-import core.effects as fx
+import numpy as np
+
 from .colors import *
-from .utils import EggClockTimer, blend, clamp
+from .schedule import Schedule
+from .utils import EggClockTimer, clamp, cubic
 import itertools as itt
 
 __all__ = ['ProgramRunner']
@@ -12,11 +15,16 @@ _now = dt.datetime.now
 
 _is_resettable = lambda obj: callable(getattr(obj, 'reset', None))
 _can_transition = lambda obj: callable(getattr(obj, 'can_transition', None))
+_has_quality = lambda obj: callable(getattr(obj, 'set_quality', None))
+_has_prepare = lambda obj: callable(getattr(obj, 'prepare', None))
 
 class ProgramRunner:
     pass
 
 class ProgramBase:
+    priority = 0 # wins over lower priorities when date ranges overlap
+    window = None # (on, off) times, defaults to the runner's nightly window
+
     @abstractclassmethod
     def is_scheduled(cls, when: dt.datetime) -> bool:
         return False
@@ -30,25 +38,40 @@ class ProgramBase:
     def update(self, runner: ProgramRunner, dt: float) -> None:
         pass
 
+    def set_quality(self, quality) -> None:
+        pass
+
 class DefaultProgram(ProgramBase):
     @classmethod
     def is_scheduled(cls, when: dt.date) -> bool:
         return True
 
     def start(self, runner: ProgramRunner) -> None:
-        self._fx = fx.twinkle(0x101010, itt.cycle([0xa0a0f0, 0xa0f6f6, 0xf0a0f0, 0xf0f0a0]))
+        from .effects import twinkle
+        self._fx = twinkle(0x101010, itt.cycle([0xa0a0f0, 0xa0f6f6, 0xf0a0f0, 0xf0f0a0]))
 
     def update(self, runner: ProgramRunner, dt: float) -> None:
         self._fx(runner.strip, dt)
 
 class FxLoopProgram(ProgramBase):
     def start(self, runner: ProgramRunner, delay=120, fade=3) -> None:
+        from .compositor import Compositor, Layer
+
         self._gen = None
         self._fx = None
         self._nextfx = None
 
         effects = self._createEffects(runner)
         n = len(effects)
+        for effect in effects:
+            # baked effects start baking now instead of on their first frame
+            if _has_prepare(effect):
+                effect.prepare(runner.strip.n)
+
+        self._effects = effects
+        self._crossfade = Compositor([Layer(None), Layer(None)])
+        self._fade = fade
+        self._transition_time = fade
 
         if n == 1:
             self._fx = effects[0]
@@ -56,7 +79,6 @@ class FxLoopProgram(ProgramBase):
             self._gen = itt.cycle(effects)
             self._fx = next(self._gen)
             self._timer = EggClockTimer(delay)
-            self._transition_time = fade
             self._effect_time = delay
 
         if _is_resettable(self._fx):
@@ -69,34 +91,62 @@ class FxLoopProgram(ProgramBase):
             self._update_transition(runner, dt)
         else:
             if self._fx:
-                self._fx(runner.strip, dt)
+                metrics = runner.metrics
+                if metrics is None:
+                    self._fx(runner.strip, dt)
+                else:
+                    t0 = perf_counter()
+                    self._fx(runner.strip, dt)
+                    metrics.effect(self._fx).observe(perf_counter() - t0)
 
             if self._gen and self._timer.expired():
                 #if not _can_transition(self._fx) or self._fx.can_transition():
-                    self._timer.reset(self._transition_time)
                     self._nextfx = next(self._gen)
+                    if _is_resettable(self._nextfx):
+                        self._nextfx.reset(runner)
+                    if runner.metrics is not None:
+                        runner.metrics.transition(self)
+
+                    if self._transition_time > 0.:
+                        self._timer.reset(self._transition_time)
+                        self._start_transition(runner)
+                    else:
+                        self._end_transition(runner)
+
+    def set_quality(self, quality) -> None:
+        self._transition_time = self._fade * quality.transition
+        for effect in self._effects:
+            if _has_quality(effect):
+                effect.set_quality(quality)
 
     def _update_timer(self, dt):
         if self._gen:
             self._timer(dt)
 
-    def _update_transition(self, runner, dt):
-        a = StripBuffer(runner.strip.n)
-        b = StripBuffer(runner.strip.n)
+    def _start_transition(self, runner):
+        a, b = self._crossfade.layers
+        a.effect, b.effect = self._fx, self._nextfx
+        b.opacity = 0.
 
-        self._fx(a, dt)
-        self._nextfx(b, dt)
+        # layer buffers are reused, seed them like a fresh strip would be
+        self._crossfade.prepare(runner.strip.n)
+        write_frame(a.buffer, read_frame(runner.strip))
+        b.buffer.fill(0)
 
-        cubic = lambda x: x * x * x
-        for idx, color_a, color_b in zip(range(len(a)), a, b):
-            runner.strip[idx] = blend(color_a, color_b, clamp(self._timer.expanded() / self._transition_time, 0., 1.), cubic)
+    def _update_transition(self, runner, dt):
+        t = clamp(self._timer.expanded() / self._transition_time, 0., 1.) if self._transition_time > 0. else 1.
+        self._crossfade.layers[1].opacity = cubic(t)
+        self._crossfade(runner.strip, dt)
 
         if self._timer.expired():
-            self._timer.reset(self._effect_time)
-            if _is_resettable(self._fx):
-                self._fx.reset(runner)
-            self._fx = self._nextfx
-            self._nextfx = None
+            self._end_transition(runner)
+
+    def _end_transition(self, runner):
+        self._timer.reset(self._effect_time)
+        if _is_resettable(self._fx):
+            self._fx.reset(runner)
+        self._fx = self._nextfx
+        self._nextfx = None
 
 class Halloween(FxLoopProgram):
     @classmethod
@@ -104,11 +154,13 @@ class Halloween(FxLoopProgram):
         return dt.date(when.year, 10, 1) <= when <= dt.date(when.year, 10, 31)
 
     def _createEffects(self, runner: ProgramRunner):
+        from . import effects as fx
+        from .baking import bake
         n = runner.strip.n
         return [
-            fx.color_train(6, 6, 16, [0xbf1500, 0x4b0f6e]),
-            fx.breath([0xdf1500, 0x2ccf18], .025),
-            fx.wave(1.2, (0.1, 0.8), .15, [0x6611cc]),
+            bake(fx.color_train, 6, 6, 16, [0xbf1500, 0x4b0f6e]),
+            bake(fx.breath, [0xdf1500, 0x2ccf18], .025),
+            bake(fx.wave, 1.2, (0.1, 0.8), .15, [0x6611cc]),
             #fx.rotate([0x30aa00, 0xbf1500, 0x4b0f6e, 0x000000], 3, 3),
         ]
 
@@ -118,10 +170,13 @@ class XMas(FxLoopProgram):
         return dt.date(when.year, 12, 1) <= when <= dt.date(when.year, 12, 27)
 
     def _createEffects(self, runner: ProgramRunner):
+        from . import effects as fx
+        from .baking import bake
+        from .palette import Palette
         n = runner.strip.n
         return [
             fx.twinkle(0x101010, [0x8100db, 0x1e7c20, 0x0037fb, 0xb60000, 0xdf6500]),
-            fx.color_train(3, 2, n - 10, rainbow(n - 10, 20)),
+            bake(fx.color_train, 3, 2, n - 10, Palette.rainbow(20, n - 10)),
             #fx.breath([0xff0000, 0x00ff00], .015),
         ]
 
@@ -132,58 +187,119 @@ class NewYear(FxLoopProgram):
         return dt.date(when.year, 12, 31) <= when <= dt.date(when.year + 1, 1, 2)
 
     def _createEffects(self, runner: ProgramRunner):
+        from . import effects as fx
+        from .palette import Palette
         return [
-            fx.firework_explosion(rainbow(28), .5),
-            fx.firework_rocket(rainbow(14)),
+            fx.firework_explosion(Palette.rainbow(28), .5),
+            fx.firework_rocket(Palette.rainbow(14)),
         ]
 
+class EffectProgram(FxLoopProgram):
+    # a single registered effect with its example arguments, for previews
+    def __init__(self, name: str):
+        self.name = name
+
+    def _createEffects(self, runner: ProgramRunner):
+        from .effects import EFFECTS
+        effect = EFFECTS[self.name]
+        return [effect(*effect.example(runner.strip.n))]
+
 class ProgramRunner:
-    def __init__(self, strip) -> None:
+    def __init__(self, strip, output = None, skip_unchanged: bool = True) -> None:
         self.strip = strip
+        self.output = output
+        self.skip_unchanged = skip_unchanged
+        self.transmits = 0
+        self.skipped = 0
+        self.recorder = None
+        self.metrics = None
+        self.quality = None
+        self._shown = None
         self._p = None
 
     def start(self, p: ProgramBase, *args, **kwargs) -> None:
         if self._p: self._p.end(self)
         self._p = p
+        self.invalidate()
         if self._p: self._p.start(self, *args, **kwargs)
+        if self._p and self.quality is not None: self._p.set_quality(self.quality)
 
     def update(self, dt: float) -> None:
         if self._p:
-            self._p.update(self, dt)
+            self.render(dt)
+            self.present()
+
+    def render(self, dt: float) -> None:
+        if self._p:
+            if self.metrics is None:
+                self._p.update(self, dt)
+            else:
+                t0 = perf_counter()
+                self._p.update(self, dt)
+                self.metrics.program(self._p).observe(perf_counter() - t0)
+            if self.recorder is not None:
+                self.recorder.write(dt, self.strip)
+
+    def set_quality(self, quality) -> None:
+        self.quality = quality
+        if self._p:
+            self._p.set_quality(quality)
+
+    def invalidate(self) -> None:
+        self._shown = None
+
+    def _changed(self) -> bool:
+        frame = getattr(self.strip, 'array', None)
+        if frame is None:
+            frame = list(self.strip)
+            changed = frame != self._shown
+            self._shown = frame
+            return changed
+
+        if self._shown is None or getattr(self._shown, 'shape', None) != frame.shape:
+            self._shown = frame.copy()
+            return True
+        if np.array_equal(frame, self._shown):
+            return False
+        np.copyto(self._shown, frame)
+        return True
+
+    def present(self) -> None:
+        if self.skip_unchanged and not self._changed():
+            self.skipped += 1
+            if self.metrics is not None:
+                self.metrics.skipped.inc()
+            return
+
+        self.transmits += 1
+        t0 = perf_counter()
+        if self.output is not None:
+            self.output.present(self.strip)
+        else:
             self.strip.show()
+        if self.metrics is not None:
+            self.metrics.transmit.observe(perf_counter() - t0)
+            self.metrics.transmitted.inc()
 
     def program_type(self) -> type:
         return type(self._p) if self._p else None
 
     @classmethod
-    def check_schedule(cls, when: dt.datetime) -> type:
-        prg_type = None
-
-        night_date, next_check = cls.to_programmed_time(when)
-        if night_date:
-            for program in cls._special_programs:
-                if program.is_scheduled(night_date):
-                    prg_type = program
-
-            if prg_type is None:
-                prg_type = cls._default_program
+    def programs(cls) -> dict:
+        return {p.__name__: p for p in [cls._default_program] + cls._special_programs}
 
-        return (prg_type, next_check)
+    @classmethod
+    def check_schedule(cls, when: dt.datetime) -> type:
+        return cls.schedule().lookup(when)
 
     @classmethod
-    def to_programmed_time(cls, when: dt.datetime):
-        today = when.date()
-
-        if (when.time() >= cls._start_time):
-            tomorrow = today + dt.timedelta(days=1)
-            return (today, dt.datetime.combine(tomorrow, cls._end_time))
-        elif (when.time() < cls._end_time):
-            yesterday = today - dt.timedelta(days=1)
-            return (yesterday, dt.datetime.combine(today, cls._end_time))
-        else:
-            return (None, dt.datetime.combine(today, cls._start_time))
+    def schedule(cls) -> Schedule:
+        if cls._schedule is None:
+            cls._schedule = Schedule(cls._special_programs, cls._default_program, (cls._start_time, cls._end_time))
+        return cls._schedule
 
     _start_time = dt.time(16, 30, 0)
     _end_time = dt.time(1, 0, 0)
     _default_program = DefaultProgram
     _special_programs = [Halloween, XMas, NewYear]
+    _schedule = None
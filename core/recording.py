@@ -0,0 +1,107 @@
+import os
+import queue
+import struct
+import threading
+from time import perf_counter
+
+import numpy as np
+
+from .colors import read_frame
+
+__all__ = ['Recorder', 'Recording', 'load_recording']
+
+MAGIC = b'OLRC'
+VERSION = 1
+
+# magic, version, channels, led count, seed, name; frames follow as fixed size records
+_HEADER = struct.Struct('<4sHHIq44s')
+
+def frame_dtype(n: int) -> np.dtype:
+    return np.dtype([('t', '<f8'), ('dt', '<f8'), ('frame', 'u1', (n, 3))])
+
+class Recorder:
+    def __init__(self, path: str, n: int, name: str = '', seed: int = 0, max_pending: int = 1024):
+        self.path = path
+        self.n = n
+        self.frames = 0
+        self.stalls = 0
+        self._dtype = frame_dtype(n)
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(MAGIC, VERSION, 3, n, seed, name.encode()[:44]))
+        self._queue = queue.Queue(max_pending)
+        self._start = None
+        self._thread = threading.Thread(target=self._run, name='led-recorder', daemon=True)
+        self._thread.start()
+
+    def write(self, dt: float, strip) -> None:
+        now = perf_counter()
+        if self._start is None:
+            self._start = now
+
+        record = np.empty((), dtype=self._dtype)
+        record['t'] = now - self._start
+        record['dt'] = dt
+        record['frame'] = read_frame(strip)
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            # the disk fell behind, wait rather than lose a frame
+            self.stalls += 1
+            self._queue.put(record)
+        self.frames += 1
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            self._file.write(record.tobytes())
+        self._file.close()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class Recording:
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            magic, version, channels, n, seed, name = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC or version != VERSION or channels != 3:
+            raise ValueError('{} is not a version {} frame recording'.format(path, VERSION))
+
+        self.path = path
+        self.n = n
+        self.seed = seed
+        self.name = name.rstrip(b'\0').decode()
+
+        # a recorder that was killed can leave part of a frame at the end, only map whole ones
+        dtype = frame_dtype(n)
+        count = (os.path.getsize(path) - _HEADER.size) // dtype.itemsize
+        if count > 0:
+            self.records = np.memmap(path, dtype=dtype, mode='r', offset=_HEADER.size, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=dtype)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def frames(self) -> np.ndarray:
+        return self.records['frame']
+
+    @property
+    def dt(self) -> np.ndarray:
+        return self.records['dt']
+
+    @property
+    def t(self) -> np.ndarray:
+        return self.records['t']
+
+def load_recording(path: str) -> Recording:
+    return Recording(path)
@@ -0,0 +1,101 @@
+import datetime as dt
+from bisect import bisect_right
+from collections import namedtuple
+from typing import Iterator, List, Sequence, Tuple
+
+__all__ = ['Schedule', 'Conflict']
+
+Conflict = namedtuple('Conflict', 'night winner overruled resolved_by')
+
+_DAY = dt.timedelta(days=1)
+
+class _YearIndex:
+    __slots__ = ('times', 'programs', 'conflicts')
+
+    def __init__(self):
+        self.times = []
+        self.programs = []
+        self.conflicts = []
+
+    def append(self, when: dt.datetime, program: type) -> None:
+        if self.times and when <= self.times[-1]:
+            # a window overlapping the previous night is clipped to start where it ended
+            when = self.times.pop()
+            self.programs.pop()
+        if self.programs and self.programs[-1] is program:
+            return
+        self.times.append(when)
+        self.programs.append(program)
+
+class Schedule:
+    def __init__(self, programs: Sequence[type], default: type, window: Tuple[dt.time, dt.time]):
+        self._programs = list(programs)
+        self._default = default
+        self._window = window
+        self._years = {}
+
+    def _night(self, night: dt.date, conflicts: List[Conflict]) -> type:
+        matches = [(getattr(p, 'priority', 0), i, p) for i, p in enumerate(self._programs) if p.is_scheduled(night)]
+        if not matches:
+            return self._default
+
+        matches.sort(key=lambda m: m[:2])
+        winner_priority, _, winner = matches[-1]
+        for priority, _, program in matches[:-1]:
+            conflicts.append(Conflict(night, winner, program, 'priority' if priority < winner_priority else 'order'))
+        return winner
+
+    def _bounds(self, night: dt.date, program: type) -> Tuple[dt.datetime, dt.datetime]:
+        start, end = getattr(program, 'window', None) or self._window
+        end_date = night + _DAY if end <= start else night
+        return dt.datetime.combine(night, start), dt.datetime.combine(end_date, end)
+
+    def _compile(self, year: int) -> _YearIndex:
+        # nights from Dec 31 of the previous year cover the early hours of Jan 1
+        index = _YearIndex()
+        night = dt.date(year - 1, 12, 31)
+        last = dt.date(year, 12, 31)
+        while night <= last:
+            program = self._night(night, index.conflicts)
+            start, end = self._bounds(night, program)
+            index.append(start, program)
+            index.append(end, None)
+            night += _DAY
+
+        for c in index.conflicts:
+            if c.resolved_by == 'order' and c.night.year == year:
+                print('Schedule conflict on {}: {} overrides {} by list order'.format(c.night, c.winner.__name__, c.overruled.__name__))
+        return index
+
+    def year(self, year: int) -> _YearIndex:
+        index = self._years.get(year)
+        if index is None:
+            index = self._years[year] = self._compile(year)
+        return index
+
+    def invalidate(self) -> None:
+        self._years.clear()
+
+    def lookup(self, when: dt.datetime) -> Tuple[type, dt.datetime]:
+        index = self.year(when.year)
+        i = bisect_right(index.times, when) - 1
+        if i + 1 < len(index.times):
+            return index.programs[i], index.times[i + 1]
+
+        # past the last boundary of this year's index, only reachable at the very end of Dec 31
+        return self.lookup(dt.datetime(when.year + 1, 1, 1)) if when.year < dt.MAXYEAR else (None, dt.datetime.max)
+
+    def conflicts(self, year: int) -> List[Conflict]:
+        return [c for c in self.year(year).conflicts if c.night.year == year]
+
+    def simulate(self, start: dt.datetime, end: dt.datetime) -> Iterator[Tuple[dt.datetime, type, dt.datetime]]:
+        when = start
+        while when < end:
+            program, until = self.lookup(when)
+            yield when, program, until
+            when = until
+
+    def intervals(self, year: int) -> List[Tuple[dt.datetime, dt.datetime, type]]:
+        start = dt.datetime(year, 1, 1)
+        end = dt.datetime(year + 1, 1, 1)
+        return [(when, min(until, end), program) for when, program, until in self.simulate(start, end) if program is not None]
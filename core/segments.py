@@ -0,0 +1,167 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from time import perf_counter
+
+from .program import ProgramRunner
+
+__all__ = ['Segment', 'SegmentRunner']
+
+class Segment:
+    def __init__(self, name: str, runner: ProgramRunner, group: ProgramRunner = None):
+        self.name = name
+        self.runner = runner
+        self.group = group
+        self.frames = 0
+        self.overruns = 0
+        self.render_time = 0.
+        self.mean_render_time = 0.
+        self.max_render_time = 0.
+        self._future = None
+        self._started = 0.
+        self._dt = 0.
+
+    @property
+    def busy(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def _collect(self) -> bool:
+        if self._future is None or not self._future.done():
+            return False
+        future, self._future = self._future, None
+        future.result()
+        return True
+
+    def _present(self) -> None:
+        if self.group is None:
+            self.runner.present()
+
+    def _render(self, dt: float) -> None:
+        t0 = perf_counter()
+        self.runner.render(dt)
+        t = perf_counter() - t0
+
+        self.frames += 1
+        self.render_time = t
+        self.mean_render_time += (t - self.mean_render_time) * (1. if self.frames == 1 else .05)
+        self.max_render_time = max(self.max_render_time, t)
+
+    def stats(self) -> dict:
+        return {
+            'frames': self.frames,
+            'overruns': self.overruns,
+            'render_ms': self.render_time * 1000.,
+            'mean_render_ms': self.mean_render_time * 1000.,
+            'max_render_ms': self.max_render_time * 1000.,
+        }
+
+class SegmentRunner:
+    def __init__(self, budget: float = None, workers: int = None):
+        self.budget = budget
+        self._workers = workers
+        self._pool = None
+        self._segments = {}
+        self._groups = []
+
+    def add_output(self, strip, output) -> ProgramRunner:
+        # a device shared by several segments rendering into views of strip
+        group = ProgramRunner(strip, output)
+        self._groups.append(group)
+        return group
+
+    def add(self, name: str, strip, output = None, group: ProgramRunner = None) -> Segment:
+        segment = Segment(name, ProgramRunner(strip, output), group)
+        self._segments[name] = segment
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        return segment
+
+    def __getitem__(self, name: str) -> Segment:
+        return self._segments[name]
+
+    def __iter__(self):
+        return iter(self._segments.values())
+
+    def start(self, name: str, p, *args, **kwargs) -> None:
+        segment = self._segments[name]
+        self._settle(segment)
+        segment.runner.start(p, *args, **kwargs)
+
+    def set_quality(self, quality) -> None:
+        self.settle_all()
+        for segment in self._segments.values():
+            segment.runner.set_quality(quality)
+
+    def settle_all(self) -> None:
+        # wait out frames still rendering, their results are dropped
+        for segment in self._segments.values():
+            self._settle(segment)
+
+    def _settle(self, segment: Segment) -> None:
+        if segment._future is not None:
+            segment._future.result()
+            segment._future = None
+
+    def program_type(self, name: str) -> type:
+        return self._segments[name].runner.program_type()
+
+    def update(self, dt: float) -> None:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self._workers or max(len(self._segments), 1), 'led-segment')
+
+        pending = []
+        for segment in self._segments.values():
+            if segment.runner.program_type() is None:
+                # nothing to render or send while idle
+                segment._dt = 0.
+                continue
+
+            segment._dt += dt
+            if segment.busy:
+                # still on an earlier frame, it keeps the time for its next one
+                segment.overruns += 1
+                continue
+
+            if segment._collect():
+                # finished after an earlier update gave up on it
+                segment._present()
+
+            segment._started = perf_counter()
+            segment._future = self._pool.submit(segment._render, segment._dt)
+            segment._dt = 0.
+            pending.append(segment._future)
+
+        wait(pending, timeout=self.budget)
+
+        for segment in self._segments.values():
+            if segment._collect():
+                segment._present()
+
+        for group in self._groups:
+            members = [s for s in self._segments.values() if s.group is group]
+            if not any(s.busy for s in members) and any(s.runner.program_type() is not None for s in members):
+                group.present()
+
+    def frame_cost(self) -> float:
+        # the slowest segment sets the cost, one still rendering counts for as long as it has been running
+        now = perf_counter()
+        cost = 0.
+        for segment in self._segments.values():
+            if segment.busy:
+                cost = max(cost, now - segment._started)
+            elif segment.runner.program_type() is not None:
+                cost = max(cost, segment.render_time)
+        return cost
+
+    def invalidate(self) -> None:
+        for segment in self._segments.values():
+            segment.runner.invalidate()
+        for group in self._groups:
+            group.invalidate()
+
+    def stats(self) -> dict:
+        return {name: segment.stats() for name, segment in self._segments.items()}
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,121 @@
+import importlib.abc
+import sys
+from time import perf_counter
+
+__all__ = ['ImportTimer', 'enable', 'mark', 'first_frame', 'report']
+
+_T0 = perf_counter()
+
+def _process_age() -> float:
+    # seconds the process had been alive when this module was imported, Linux only
+    try:
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        with open('/proc/self/stat') as f:
+            started = int(f.read().rsplit(')', 1)[1].split()[19])
+        import os
+        return uptime - started / os.sysconf('SC_CLK_TCK') - (perf_counter() - _T0)
+    except (OSError, ValueError, IndexError):
+        return None
+
+class _TimedLoader:
+    def __init__(self, loader, timer):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        with self._timer.timing(spec.name):
+            return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._timer.timing(module.__name__):
+            self._loader.exec_module(module)
+
+class _Timing:
+    def __init__(self, timer, name):
+        self._timer = timer
+        self._name = name
+
+    def __enter__(self):
+        self._timer._stack.append(0.)
+        self._start = perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = perf_counter() - self._start
+        children = self._timer._stack.pop()
+        if self._timer._stack:
+            self._timer._stack[-1] += elapsed
+        total, own = self._timer.times.get(self._name, (0., 0.))
+        self._timer.times[self._name] = (total + elapsed, own + elapsed - children)
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    def __init__(self):
+        self.times = {}
+        self._stack = []
+
+    def timing(self, name: str) -> _Timing:
+        return _Timing(self, name)
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+    def install(self) -> 'ImportTimer':
+        sys.meta_path.insert(0, self)
+        return self
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def total(self) -> float:
+        return sum(own for _, own in self.times.values())
+
+    def slowest(self, count: int = 15):
+        return sorted(self.times.items(), key=lambda kv: kv[1][1], reverse=True)[:count]
+
+_timer = None
+_marks = []
+_reported = False
+
+def enable() -> ImportTimer:
+    global _timer
+    if _timer is None:
+        _timer = ImportTimer().install()
+    return _timer
+
+def mark(label: str) -> float:
+    elapsed = perf_counter() - _T0
+    _marks.append((label, elapsed))
+    return elapsed
+
+def first_frame() -> None:
+    global _reported
+    if _reported:
+        return
+    _reported = True
+    mark('first frame')
+    if _timer is not None:
+        _timer.uninstall()
+        report()
+
+def report(count: int = 15) -> None:
+    age = _process_age()
+    if age is not None:
+        print('Interpreter startup before main: {:.1f} ms'.format(age * 1000.))
+    if _timer is not None:
+        print('Imports: {} modules in {:.1f} ms, slowest (self / cumulative):'.format(len(_timer.times), _timer.total() * 1000.))
+        for name, (total, own) in _timer.slowest(count):
+            print('  {:8.1f} {:8.1f} ms  {}'.format(own * 1000., total * 1000., name))
+    for label, elapsed in _marks:
+        print('{}: {:.1f} ms after start'.format(label.capitalize(), elapsed * 1000.))
@@ -0,0 +1,107 @@
+import asyncio
+import math
+from time import monotonic, sleep
+
+__all__ = ['FrameScheduler']
+
+class FrameScheduler:
+    DROP = 'drop'
+    CATCH_UP = 'catch-up'
+
+    def __init__(self, fps: float = 24., late_policy: str = DROP, max_catch_up: int = 3, clock=monotonic, sleep=sleep):
+        if late_policy not in (self.DROP, self.CATCH_UP):
+            raise ValueError('unknown late frame policy {!r}'.format(late_policy))
+
+        self.late_policy = late_policy
+        self.max_catch_up = max_catch_up
+        self._clock = clock
+        self._sleep = sleep
+        self._deadline = None
+        self._last = None
+        self._on_time = True
+        self.set_fps(fps)
+        self.reset_stats()
+
+    def set_fps(self, fps: float) -> None:
+        self.fps = fps
+        self.period = 1. / fps
+        self._interval = self.period
+
+    def start(self) -> None:
+        self._last = self._clock()
+        self._deadline = self._last + self.period
+
+    def reset_stats(self) -> None:
+        self.frames = 0
+        self.missed = 0
+        self.dropped = 0
+        self._jitter_n = 0
+        self._jitter_mean = 0.
+        self._jitter_m2 = 0.
+        self._jitter_max = 0.
+
+    def wait(self) -> float:
+        delay = self.delay()
+        if delay > 0.:
+            self._sleep(delay)
+        return self.tick()
+
+    async def wait_async(self) -> float:
+        delay = self.delay()
+        # a late frame still yields once so the event loop can serve other tasks
+        await asyncio.sleep(max(delay, 0.))
+        return self.tick()
+
+    def delay(self) -> float:
+        if self._deadline is None:
+            self.start()
+
+        delay = self._deadline - self._clock()
+        self._on_time = delay >= 0.
+        return delay
+
+    def tick(self) -> float:
+        now = self._clock()
+        if self._on_time:
+            self._record_jitter(now - self._deadline)
+            self._deadline += self.period
+        else:
+            late = now - self._deadline
+            self.missed += 1
+            self._record_jitter(late)
+
+            behind = int(late / self.period)
+            if self.late_policy == self.DROP:
+                self.dropped += behind
+                self._deadline += (behind + 1) * self.period
+            elif behind >= self.max_catch_up:
+                # too far behind to catch up, restart the grid from now
+                self.dropped += behind
+                self._deadline = now + self.period
+            else:
+                self._deadline += self.period
+
+        self.frames += 1
+        dt, self._last = now - self._last, now
+        self._interval += (dt - self._interval) * .05
+        return self.period if self.late_policy == self.CATCH_UP else dt
+
+    def _record_jitter(self, value: float) -> None:
+        self._jitter_n += 1
+        delta = value - self._jitter_mean
+        self._jitter_mean += delta / self._jitter_n
+        self._jitter_m2 += delta * (value - self._jitter_mean)
+        self._jitter_max = max(self._jitter_max, value)
+
+    def stats(self) -> dict:
+        std = math.sqrt(self._jitter_m2 / self._jitter_n) if self._jitter_n else 0.
+        return {
+            'fps': self.fps,
+            'achieved_fps': 1. / self._interval if self._interval > 0. else 0.,
+            'frames': self.frames,
+            'missed': self.missed,
+            'dropped': self.dropped,
+            'jitter_mean_ms': self._jitter_mean * 1000.,
+            'jitter_std_ms': std * 1000.,
+            'jitter_max_ms': self._jitter_max * 1000.,
+        }
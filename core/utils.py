@@ -1,5 +1,7 @@
 from time import time as _now
 
+import numpy as np
+
 def split_color(c, width=3):
     if type(c) is int:
         if width == 3:
@@ -20,6 +22,21 @@ def recombine(*args):
         return (args[0] & 0xff) << 16 | (args[1] & 0xff) << 8 | (args[2] & 0xff)
     else:
         raise
+
+def split_colors(colors) -> np.ndarray:
+    if isinstance(colors, np.ndarray):
+        if colors.ndim >= 2 and colors.shape[-1] == 3:
+            return colors.astype(np.uint8, copy=False)
+        packed = colors.astype(np.uint32, copy=False)
+        return np.stack((packed >> 16 & 0xff, packed >> 8 & 0xff, packed & 0xff), axis=-1).astype(np.uint8)
+    elif type(colors) is int or type(colors) is tuple:
+        return np.array(split_color(colors), dtype=np.uint8)
+    else:
+        return np.array([split_color(c if type(c) is tuple else int(c)) for c in colors], dtype=np.uint8).reshape(-1, 3)
+
+def recombine_colors(colors: np.ndarray) -> np.ndarray:
+    c = colors.astype(np.uint32)
+    return c[..., 0] << 16 | c[..., 1] << 8 | c[..., 2]
     
 
 def clamp(val, low, high):
@@ -49,10 +66,30 @@ def blend_max(color1, color2):
         max(c1[1], c2[1]),
         max(c1[2], c2[2]))
 
-
 def fade(color1, color2, t: float):
-    ease = lambda t: (t * t) / (2. * (t * t - t) + 1.)
-    return blend(color1, color2, ease(t))
+    return blend(color1, color2, fade_ease(t))
+
+def cubic(t):
+    return t * t * t
+
+def fade_ease(t):
+    return (t * t) / (2. * (t * t - t) + 1.)
+
+def blend_frame(frame1, frame2, t, ease = None) -> np.ndarray:
+    t = np.clip(np.asarray(t, dtype=np.float32), 0., 1.)
+    t = t if ease is None else ease(t)
+    if t.ndim > 0:
+        t = t[..., np.newaxis]
+
+    c1 = split_colors(frame1).astype(np.float32)
+    c2 = split_colors(frame2).astype(np.float32)
+    return (c1 * (1. - t) + c2 * t).astype(np.uint8)
+
+def blend_max_frame(frame1, frame2) -> np.ndarray:
+    return np.maximum(split_colors(frame1), split_colors(frame2))
+
+def fade_frame(frame1, frame2, t) -> np.ndarray:
+    return blend_frame(frame1, frame2, fade_ease(np.asarray(t, dtype=np.float32)))
 
 class EggClockTimer:
     def __init__(self, timeout: float = 0.):
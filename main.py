@@ -1,14 +1,60 @@
 import argparse
 import sys
 
+from core import startup
+
 parser = argparse.ArgumentParser()
 parser.add_argument('--visualize', '-v', action='store_true')
+parser.add_argument('--leds', type=int)
+parser.add_argument('--spacetime', metavar='PATH')
+parser.add_argument('--seconds', type=float)
+parser.add_argument('--preview', metavar='PATH')
+parser.add_argument('--bench', '-b', action='store_true')
+parser.add_argument('--bench-sizes', type=int, nargs='+')
+parser.add_argument('--bench-frames', type=int)
+parser.add_argument('--bench-seed', type=int)
+parser.add_argument('--bench-only', nargs='+')
+parser.add_argument('--bench-output')
+parser.add_argument('--record', metavar='PATH')
+parser.add_argument('--record-frames', type=int)
+parser.add_argument('--record-leds', type=int)
+parser.add_argument('--target')
+parser.add_argument('--compare', metavar='PATH')
+parser.add_argument('--import-report', action='store_true')
+parser.add_argument('--control', nargs='+', metavar='COMMAND')
+parser.add_argument('--control-socket')
 
 args = parser.parse_args()
+if args.spacetime and not args.target:
+    parser.error('--spacetime requires --target')
+
+if args.import_report:
+    startup.enable()
 
 if args.visualize:
     import vis
-    vis.run()
+    vis.run(**({'led_count': args.leds} if args.leds else {}))
+elif args.spacetime:
+    from vis import spacetime
+    opts = {'seconds': args.seconds, 'n': args.leds, 'seed': args.bench_seed}
+    spacetime.run(args.target, args.spacetime, preview_path=args.preview, **{k: v for k, v in opts.items() if v is not None})
+elif args.bench:
+    import bench
+    opts = {'sizes': args.bench_sizes, 'frames': args.bench_frames, 'seed': args.bench_seed}
+    bench.run(only=args.bench_only, output=args.bench_output, **{k: v for k, v in opts.items() if v is not None})
+elif args.control:
+    import json
+    from show import control
+    reply = control.send(control.parse_command(args.control), path=args.control_socket)
+    print(json.dumps(reply, indent=1))
+    sys.exit(0 if reply.get('ok') else 1)
+elif args.compare:
+    import bench
+    sys.exit(0 if bench.run_compare(args.compare) else 1)
+elif args.record and args.target:
+    import bench
+    opts = {'frames': args.record_frames, 'n': args.record_leds, 'seed': args.bench_seed}
+    bench.record(args.target, args.record, **{k: v for k, v in opts.items() if v is not None})
 else:
     import show
-    show.run()
\ No newline at end of file
+    show.run(record=args.record)
\ No newline at end of file
@@ -1 +1,3 @@
-from .main import run
\ No newline at end of file
+def run(record: str = None):
+    from .main import run
+    run(record)
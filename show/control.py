@@ -0,0 +1,109 @@
+import asyncio
+import json
+import socket
+
+CONTROL_PORT = 9109
+MAX_REQUEST = 4096
+
+# One JSON object per line in each direction, e.g.
+#   {"cmd": "start", "name": "Halloween"}  ->  {"ok": true, ...}
+COMMANDS = {
+    'list': lambda app, req: app.targets(),
+    'status': lambda app, req: app.status(),
+    'start': lambda app, req: app.start_target(req['name'], req.get('segment')),
+    'preview': lambda app, req: app.start_target(req['name'], req.get('segment'), float(req.get('seconds', 30.))),
+    'recheck': lambda app, req: app.recheck(),
+    'brightness': lambda app, req: app.set_brightness(float(req['value'])),
+}
+
+def dispatch(app, request: dict) -> dict:
+    cmd = request.get('cmd')
+    handler = COMMANDS.get(cmd) if isinstance(cmd, str) else None
+    if handler is None:
+        return {'ok': False, 'error': 'unknown command {!r}'.format(cmd)}
+
+    try:
+        result = handler(app, request)
+    except Exception as e:
+        # a bad request gets an error reply, it must not take the connection down
+        return {'ok': False, 'error': '{}: {}'.format(type(e).__name__, e)}
+    return dict(result or {}, ok=True)
+
+class ControlServer:
+    def __init__(self, app, port: int = CONTROL_PORT, path: str = None):
+        self._app = app
+        self._port = port
+        self._path = path
+        self._server = None
+
+    @property
+    def address(self):
+        return self._path if self._path is not None else ('127.0.0.1', self._port)
+
+    async def start(self) -> 'ControlServer':
+        if self._path is not None:
+            self._server = await asyncio.start_unix_server(self._client, self._path, limit=MAX_REQUEST)
+        else:
+            self._server = await asyncio.start_server(self._client, '127.0.0.1', self._port, limit=MAX_REQUEST)
+            self._port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    reply = {'ok': False, 'error': 'request too long'}
+                    line = None
+                else:
+                    if not line:
+                        break
+                    try:
+                        request = json.loads(line)
+                        reply = dispatch(self._app, request) if isinstance(request, dict) else {'ok': False, 'error': 'expected an object'}
+                    except json.JSONDecodeError as e:
+                        reply = {'ok': False, 'error': 'bad request: {}'.format(e)}
+
+                writer.write(json.dumps(reply).encode('utf-8') + b'\n')
+                await writer.drain()
+                if line is None:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+def parse_command(words) -> dict:
+    cmd, args = words[0], words[1:]
+    if cmd in ('start', 'preview'):
+        request = {'cmd': cmd, 'name': args[0]}
+        if cmd == 'preview' and len(args) > 1:
+            request['seconds'] = float(args[1])
+        elif cmd == 'start' and len(args) > 1:
+            request['segment'] = args[1]
+        return request
+    if cmd == 'brightness':
+        return {'cmd': cmd, 'value': float(args[0])}
+    return {'cmd': cmd}
+
+def send(request: dict, port: int = CONTROL_PORT, path: str = None, timeout: float = 5.) -> dict:
+    if path is not None:
+        conn = socket.socket(socket.AF_UNIX)
+        address = path
+    else:
+        conn = socket.socket(socket.AF_INET)
+        address = ('127.0.0.1', port)
+
+    with conn:
+        conn.settimeout(timeout)
+        conn.connect(address)
+        conn.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with conn.makefile('rb') as f:
+            return json.loads(f.readline())
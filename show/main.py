@@ -1,22 +1,71 @@
+import asyncio
 import datetime as dt
-from time import sleep, time
 
 _now = dt.datetime.now
 
 import board
 import neopixel
 
-from core import ProgramRunner
+from core import ProgramRunner, startup
+from core.program import EffectProgram
+from core.colors import ArrayStripBuffer
+from core.output import ColorCorrection, Output, PipelinedOutput
+from core.governor import Governor
+from core.metrics import REGISTRY, MetricsServer, RunnerMetrics
+from core.recording import Recorder
+from core.segments import SegmentRunner
+from core.timing import FrameScheduler
 from .app_mutex import AppMutex
+from .control import CONTROL_PORT, ControlServer
+
+FPS = 24.
+LATE_POLICY = FrameScheduler.CATCH_UP
+
+GAMMA = 2.2
+WHITE_BALANCE = (1., 1., 1.)
+BRIGHTNESS = 1.
+
+PIPELINED = True
+
+GOVERNOR = True # step quality down when rendering runs over the frame budget
+
+STRIPS = [
+    # name, board pin, led count
+    ('front', 'D18', 30 * 5 - 1),
+]
+SEGMENT_BUDGET = .8 # fraction of a frame period the segments get to render
+
+METRICS_PORT = 9108 # served on localhost only, None to disable
+METRICS_SOCKET = None # serve on this unix socket instead of the port
+
+CONTROL_SOCKET = None # listen on this unix socket instead of CONTROL_PORT
 
 class App:
-    def __init__(self):
-        self._last_update = 0
-        pass
+    def __init__(self, fps: float = FPS, late_policy: str = LATE_POLICY, record: str = None):
+        self._scheduler = FrameScheduler(fps, late_policy)
+        self._record = record
 
     def __enter__(self):
-        self.leds = neopixel.NeoPixel(board.D18, 30 * 5 - 1, brightness=1, auto_write=False)
-        self._runner = ProgramRunner(self.leds)
+        self.correction = ColorCorrection(GAMMA, WHITE_BALANCE, BRIGHTNESS)
+        self._runner = SegmentRunner(SEGMENT_BUDGET * self._scheduler.period)
+        self._devices = []
+
+        for name, pin, count in STRIPS:
+            leds = neopixel.NeoPixel(getattr(board, pin), count, brightness=1, auto_write=False)
+            output = (PipelinedOutput if PIPELINED else Output)(leds, self.correction)
+            segment = self._runner.add(name, ArrayStripBuffer(count), output)
+            self._devices.append((leds, output))
+            print("Strip {} writes frames {}".format(name, 'directly into the driver buffer' if output.zero_copy else 'through the driver'))
+
+            segment.runner.metrics = RunnerMetrics(name)
+
+            if self._record:
+                path = self._record if len(STRIPS) == 1 else '{}.{}'.format(self._record, name)
+                segment.runner.recorder = Recorder(path, count, 'show:{}'.format(name))
+                print("Recording strip {} to {}".format(name, path))
+
+        self._governor = Governor(self._scheduler, self._runner, on_change=self._set_budget) if GOVERNOR else None
+        self._metrics = self._start_metrics()
         self.clear_leds()
         
         now = _now()
@@ -26,36 +75,133 @@ class App:
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self.leds.deinit()
+        if self._metrics is not None:
+            self._metrics.close()
+        self._runner.close()
+        for segment in self._runner:
+            if segment.runner.recorder is not None:
+                segment.runner.recorder.close()
+        for leds, output in self._devices:
+            output.close()
+            leds.deinit()
         return (exc_type is None)
 
+    def _start_metrics(self):
+        if METRICS_PORT is None and METRICS_SOCKET is None:
+            return None
+
+        scheduler = self._scheduler
+        REGISTRY.gauge('leds_target_fps', 'Configured frame rate.').set_function(lambda: scheduler.fps)
+        REGISTRY.gauge('leds_achieved_fps', 'Smoothed achieved frame rate.').set_function(lambda: scheduler.stats()['achieved_fps'])
+        REGISTRY.counter('leds_frames_missed_total', 'Frames that started after their deadline.').set_function(lambda: scheduler.missed)
+        REGISTRY.counter('leds_frames_dropped_total', 'Frame slots skipped to catch up.').set_function(lambda: scheduler.dropped)
+        if self._governor is not None:
+            REGISTRY.gauge('leds_quality_level', 'Current governor quality level, 0 is full quality.').set_function(lambda: self._governor.level)
+        overruns = REGISTRY.counter('leds_segment_overruns_total', 'Frames a segment did not finish within its budget.', ('segment',))
+        for segment in self._runner:
+            overruns.labels(segment.name).set_function(lambda segment=segment: segment.overruns)
+
+        server = MetricsServer(REGISTRY, port=METRICS_PORT, path=METRICS_SOCKET).start()
+        print('Serving metrics on {}'.format(server.address))
+        return server
+
     def _update_schedule(self, when: dt.datetime):
         program_type, self._next_check = ProgramRunner.check_schedule(when)
-        if program_type != self._runner.program_type():
+        if any(program_type != segment.runner.program_type() for segment in self._runner):
             self.clear_leds()
-            self._runner.start(program_type() if program_type is not None else None)
-            self._last_update = time()
+            for segment in self._runner:
+                self._runner.start(segment.name, program_type() if program_type is not None else None)
             print('It is {} ; lauching program type {}'.format(when, program_type))
+        print('Frame pacing: {}'.format(self._scheduler.stats()))
+        for segment in self._runner:
+            print('Segment {}: {} ; {} sent, {} unchanged frames skipped'.format(
+                segment.name, segment.stats(), segment.runner.transmits, segment.runner.skipped))
         print('Next update will be at {}'.format(self._next_check))
 
     def run(self):
-        while True:
-            now = _now()
-            if now > self._next_check:
-                self._update_schedule(now)
-            else:
-                dtime = time() - self._last_update
-                self._last_update = time()
+        asyncio.run(self._run())
+
+    async def _run(self):
+        control = await ControlServer(self, CONTROL_PORT, CONTROL_SOCKET).start()
+        print('Listening for control commands on {}'.format(control.address))
+        try:
+            dtime = self._scheduler.period
+            self._scheduler.start()
+            while True:
+                now = _now()
+                if now > self._next_check:
+                    self._update_schedule(now)
+                else:
+                    self._runner.update(dtime)
+                    if self._governor is not None:
+                        # update() gives up on slow segments after the budget, so measure the segments themselves
+                        self._governor.observe(self._runner.frame_cost())
+                    startup.first_frame()
+
+                # control commands are handled while waiting for the next frame
+                dtime = await self._scheduler.wait_async()
+        finally:
+            await control.close()
+
+    def _set_budget(self, quality) -> None:
+        self._runner.budget = SEGMENT_BUDGET * self._scheduler.period
+
+    def targets(self) -> dict:
+        from core.effects import EFFECTS
+        return {'programs': list(ProgramRunner.programs()), 'effects': sorted(EFFECTS)}
 
-                self._runner.update(dtime)
+    def status(self) -> dict:
+        return {
+            'segments': {segment.name: getattr(segment.runner.program_type(), '__name__', None) for segment in self._runner},
+            'next_check': self._next_check.isoformat(),
+            'brightness': self.correction.brightness,
+            'quality': self._governor.quality._asdict() if self._governor is not None else None,
+            'pacing': self._scheduler.stats(),
+        }
 
-            sleep(.0416) # about 24 fps
+    def start_target(self, name: str, segment: str = None, seconds: float = None) -> dict:
+        from core.effects import EFFECTS
+        programs = ProgramRunner.programs()
+        if name not in programs and name not in EFFECTS:
+            raise KeyError('no program or effect named {!r}'.format(name))
+
+        # the schedule takes over again once the preview is over
+        until = _now() + dt.timedelta(seconds=seconds) if seconds is not None else self._next_check
+
+        segments = [self._runner[segment]] if segment is not None else list(self._runner)
+        for s in segments:
+            self._runner.start(s.name, programs[name]() if name in programs else EffectProgram(name))
+        self._runner.invalidate()
+
+        self._next_check = until
+        print('Started {} on {} until {}'.format(name, ', '.join(s.name for s in segments), self._next_check))
+        return {'until': self._next_check.isoformat()}
+
+    def recheck(self) -> dict:
+        self._update_schedule(_now())
+        return self.status()
+
+    def set_brightness(self, value: float) -> dict:
+        if not 0. <= value <= 1.:
+            raise ValueError('brightness must be between 0 and 1')
+        self.correction.brightness = value
+        # unchanged frames are not sent again, force one out with the new level
+        self._runner.invalidate()
+        return {'brightness': value}
 
     def clear_leds(self):
-        self.leds.fill(0)
-        self.leds.show()
+        for leds, output in self._devices:
+            output.flush()
+            leds.fill(0)
+            leds.show()
+
+        # a late frame still rendering would otherwise land on top of the cleared strip
+        self._runner.settle_all()
+        for segment in self._runner:
+            segment.runner.strip.fill(0)
+        self._runner.invalidate()
 
-def run():
+def run(record: str = None):
     with AppMutex() as mutex:
-        with App() as app: 
+        with App(record=record) as app: 
             app.run()
@@ -1 +1,3 @@
-from .visualizer import run
\ No newline at end of file
+def run(**kwargs):
+    from .visualizer import run
+    run(**kwargs)
\ No newline at end of file
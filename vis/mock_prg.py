@@ -1,6 +1,6 @@
+import core.compositor as cmp
 import core.effects as fx
 import core.program as prg
-import core.colors as clr
 import itertools as itt
 
 class TestPrg(prg.FxLoopProgram):
@@ -8,15 +8,14 @@ class TestPrg(prg.FxLoopProgram):
     @classmethod
     def effects(cls, runner: prg.ProgramRunner):
         n = runner.strip.n
-        return {
-            "breath": (fx.breath, ([0xff0000, 0x00ff00, 0x0000ff], .025)),
-            "color_train": (fx.color_train, (3, 2, n - 10, clr.rainbow(n - 10, 20))),
-            "firework_rocket": (fx.firework_rocket, ([0x12ff34, 0xff3412, 0x1234ff], 5)),
-            "firework_explosion": (fx.firework_explosion, ([0x12ff34, 0xff3412, 0x1234ff],)),
-            "rotate": (fx.rotate, ([0x30aa00, 0xbf1500, 0x4b0f6e, 0x000000], 3, 3)),
-            "twinkle": (fx.twinkle, (0x909090, [0xffffff])),
-            "wave": (fx.wave, (1.2, (0.5, 1.0), .7, [0x6611cc]))
-        }
+        effects = {name: (effect, effect.example(n)) for name, effect in sorted(fx.EFFECTS.items())}
+        effects.update({
+            "wave + twinkle": (lambda: cmp.Compositor([
+                cmp.Layer(fx.wave(1.2, (0.3, 0.8), .7, [0x6611cc])),
+                cmp.Layer(fx.twinkle(0x000000, [0xffffff, 0xf0f0a0]), .8, cmp.Layer.SCREEN),
+            ]), ()),
+        })
+        return effects
 
     @classmethod
     def programs(cls, runner: prg.ProgramRunner):
@@ -0,0 +1,37 @@
+class SimClock:
+    SPEEDS = (1., 2., 5., 10., 30., 60.)
+
+    def __init__(self, fps: float = 24., speed: float = 1., max_steps: int = 600):
+        self.dt = 1. / fps
+        self.speed = speed
+        self.max_steps = max_steps
+        self.paused = False
+        self.time = 0.
+        self.steps = 0
+        self.behind = 0
+        self._acc = 0.
+        self._pending = 0
+
+    def pause(self, paused: bool = True) -> None:
+        self.paused = paused
+        self._acc = 0.
+
+    def step(self, count: int = 1) -> None:
+        self._pending += count
+
+    def advance(self, elapsed: float) -> int:
+        # number of fixed simulation steps to run for elapsed seconds of wall time
+        if self.paused:
+            steps, self._pending = self._pending, 0
+        else:
+            self._acc += elapsed * self.speed
+            steps = int(self._acc / self.dt)
+            self._acc -= steps * self.dt
+            if steps > self.max_steps:
+                # rendering cannot keep up with this speed, fall behind instead of spiralling
+                self.behind += steps - self.max_steps
+                steps = self.max_steps
+
+        self.steps += steps
+        self.time += steps * self.dt
+        return steps
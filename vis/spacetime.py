@@ -0,0 +1,101 @@
+import random as rnd
+import struct
+import sys
+import zlib
+from time import perf_counter
+
+import numpy as np
+
+import core.program as prg
+from core import ProgramRunner, baking
+from core.colors import ArrayStripBuffer
+from vis.mock_prg import TestPrg
+
+LED_COUNT = 149
+FRAMERATE = 24
+SEED = 1234
+
+PREVIEW_FPS = 12
+PREVIEW_MAX_FRAMES = 600 # longer runs play back as a time-lapse
+PREVIEW_SCALE = 4 # pixels per led, the preview is a band this many pixels high
+
+def _start(runner: ProgramRunner, target: str) -> None:
+    effects = TestPrg.effects(runner)
+    if target in effects:
+        runner.start(TestPrg([effects[target]]))
+        return
+
+    program = TestPrg.programs(runner).get(target) or getattr(prg, target, None)
+    if not (isinstance(program, type) and issubclass(program, prg.ProgramBase)):
+        raise KeyError('unknown effect or program {!r}'.format(target))
+    runner.start(program())
+
+@baking.synchronous()
+def render(target: str, seconds: float, n: int = LED_COUNT, fps: float = FRAMERATE, seed: int = SEED) -> np.ndarray:
+    rnd.seed(seed)
+    np.random.seed(seed)
+
+    runner = ProgramRunner(ArrayStripBuffer(n))
+    _start(runner, target)
+
+    dt = 1. / fps
+    frames = np.empty((int(seconds * fps), n, 3), dtype=np.uint8)
+    for frame in frames:
+        runner.render(dt)
+        frame[:] = runner.strip.array
+    return frames
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+def _scanlines(image: np.ndarray) -> bytes:
+    # filter type 0 (none) on every row
+    h = image.shape[0]
+    rows = np.zeros((h, 1 + image[0].size), dtype=np.uint8)
+    rows[:, 1:] = image.reshape(h, -1)
+    return rows.tobytes()
+
+def _header(image: np.ndarray) -> bytes:
+    h, w = image.shape[:2]
+    return b'\x89PNG\r\n\x1a\n' + _chunk(b'IHDR', struct.pack('>IIBBBBB', w, h, 8, 2, 0, 0, 0))
+
+def write_png(path: str, image: np.ndarray, level: int = 6) -> None:
+    with open(path, 'wb') as f:
+        f.write(_header(image))
+        f.write(_chunk(b'IDAT', zlib.compress(_scanlines(image), level)))
+        f.write(_chunk(b'IEND', b''))
+
+def write_apng(path: str, frames: np.ndarray, fps: float, level: int = 6) -> None:
+    h, w = frames.shape[1:3]
+    delay = struct.pack('>HH', int(round(1000 / fps)), 1000) # delay_num / delay_den seconds
+    with open(path, 'wb') as f:
+        f.write(_header(frames[0]))
+        f.write(_chunk(b'acTL', struct.pack('>II', len(frames), 0)))
+
+        seq = 0
+        for i, frame in enumerate(frames):
+            f.write(_chunk(b'fcTL', struct.pack('>IIIII', seq, w, h, 0, 0) + delay + b'\x00\x00'))
+            seq += 1
+            data = zlib.compress(_scanlines(frame), level)
+            if i == 0:
+                f.write(_chunk(b'IDAT', data))
+            else:
+                f.write(_chunk(b'fdAT', struct.pack('>I', seq) + data))
+                seq += 1
+        f.write(_chunk(b'IEND', b''))
+
+def preview(frames: np.ndarray, fps: float, preview_fps: float = PREVIEW_FPS) -> np.ndarray:
+    stride = max(1, int(round(fps / preview_fps)), -(-len(frames) // PREVIEW_MAX_FRAMES))
+    band = frames[::stride].repeat(PREVIEW_SCALE, axis=1)
+    return np.broadcast_to(band[:, None], (len(band), PREVIEW_SCALE) + band.shape[1:])
+
+def run(target: str, path: str, seconds: float = 60., n: int = LED_COUNT, preview_path: str = None, seed: int = SEED) -> None:
+    t0 = perf_counter()
+    frames = render(target, seconds, n, FRAMERATE, seed)
+    t1 = perf_counter()
+    write_png(path, frames)
+    if preview_path:
+        write_apng(preview_path, preview(frames, FRAMERATE), PREVIEW_FPS)
+
+    print('Rendered {:g} s of {} ({} frames x {} leds) in {:.2f} s, encoded in {:.2f} s'.format(
+        seconds, target, len(frames), n, t1 - t0, perf_counter() - t1), file=sys.stderr)
@@ -9,10 +9,14 @@ import time
 import os
 
 import itertools as itt
+import math
+
+import numpy as np
 
 from vis.mock_leds import *
 from vis.mock_prg import TestPrg
-from core import ProgramRunner
+from vis.sim_clock import SimClock
+from core import ProgramRunner, startup
 
 LED_COUNT = 60
 FRAMERATE = 24
@@ -34,9 +38,6 @@ def rgba(color):
         components = tuple((int(c, 16) for c in str_comps))
         return rgba_from_components(components);
 
-    if type(color) is Led:
-        return rgba_from_components(color.as_tuple())
-
     raise 'undefined type'
 
 colors = itt.cycle([rgba('7dac9fff'), rgba('dc7062'), rgba('66a8d4'), rgba('e5b060'), rgba('ff0000'), rgba('0000ff')])
@@ -64,43 +65,94 @@ def init_window(name, size, opts):
 
     return window
 
-def led_graph(name, leds):
-        with imgui.begin_child(name, 20 * len(leds), 200, border=False, flags=imgui.WINDOW_NO_SCROLLBAR):
+class LedTexture:
+    BAR_ROWS = 25 # texels per bar, a bar is at least MIN_ROWS tall
+    MIN_ROWS = 5
+
+    def __init__(self):
+        self.id = gl.glGenTextures(1)
+        self._shape = None
+
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.id)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
+
+    @classmethod
+    def bars(cls, frame: np.ndarray, per_row: int) -> np.ndarray:
+        # one column per led, bar height follows the brightest channel
+        n = len(frame)
+        rows = max(1, math.ceil(n / per_row))
+        cells = np.zeros((rows * per_row, 3), dtype=np.uint8)
+        cells[:n] = frame
+
+        heights = np.maximum(cells.max(axis=1) * (cls.BAR_ROWS / 255.), cls.MIN_ROWS)
+        heights[n:] = 0
+        mask = np.arange(cls.BAR_ROWS)[:, None] < heights.reshape(rows, 1, per_row)
+
+        texels = np.empty((rows, cls.BAR_ROWS, per_row, 4), dtype=np.uint8)
+        texels[..., :3] = cells.reshape(rows, 1, per_row, 3)
+        texels[..., 3] = mask * np.uint8(255)
+        return texels.reshape(rows * cls.BAR_ROWS, per_row, 4)
+
+    def upload(self, frame: np.ndarray, per_row: int) -> None:
+        texels = self.bars(frame, per_row)
+        h, w = texels.shape[:2]
+
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.id)
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+        if self._shape != (h, w):
+            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA8, w, h, 0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, texels)
+            self._shape = (h, w)
+        else:
+            gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, 0, 0, w, h, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, texels)
+
+    def delete(self) -> None:
+        gl.glDeleteTextures([self.id])
+
+def led_graph(name, strip, texture):
+        frame = strip.array
+        n = len(frame)
+
+        st = imgui.get_style()
+        pad = st.window_padding
+        avail = imgui.get_content_region_available().x - 2 * pad.x
+
+        # 16px bars like a real strip when they fit, otherwise wrap rows of thinner bars
+        bw = min(16.0, max(avail / n, 2.0))
+        per_row = min(n, max(1, int(avail // bw)))
+        rows = math.ceil(n / per_row)
+        bh = 50.0 if rows == 1 else max(12.0, 150.0 / rows)
+
+        texture.upload(frame, per_row)
+
+        with imgui.begin_child(name, per_row * bw + 2 * pad.x, rows * (bh + 1) + 2 * pad.y, border=False, flags=imgui.WINDOW_NO_SCROLLBAR):
 
             dl = imgui.get_window_draw_list()
             wp = imgui.get_window_position()
-            wz = imgui.get_window_size()
-            st = imgui.get_style()
 
-            pad = st.window_padding
-
-            bw = 16.0
-            bh = 50.0
+            x0, y0 = wp.x + pad.x, wp.y + pad.y
+            x1, y1 = x0 + per_row * bw, y0 + rows * bh
+            dl.add_image(texture.id, (x0, y0), (x1, y1))
 
             mouse_pos = imgui.get_mouse_position()
             highlighted_idx = -1
-
-            for i in range(0, len(leds)):
-                intensity = float(max(leds[i].as_tuple())) / 255.0
-
-                x = wp.x + pad.x + float(i) * bw + i
-                y = wp.y + pad.y
-                h = max(intensity * bh, 10.0)
-
-                dl.add_rect_filled(x, y, x + bw, y + h, rgba(leds[i]))
-
-                if x < mouse_pos.x <= x + bw and y < mouse_pos.y <= y + bh:
-                    highlighted_idx = i
+            if x0 <= mouse_pos.x < x1 and y0 <= mouse_pos.y < y1:
+                col = int((mouse_pos.x - x0) // bw)
+                row = int((mouse_pos.y - y0) // bh)
+                if row * per_row + col < n:
+                    highlighted_idx = row * per_row + col
+                    x, y = x0 + col * bw, y0 + row * bh
                     dl.add_rect(x, y, x + bw, y + bh, 0x66ffffff)
 
-            imgui.dummy(0, bh + pad.y)
+            imgui.dummy(0, rows * bh + pad.y)
 
-            if highlighted_idx > -1:
-                led = leds[highlighted_idx]
-                imgui.text('selected: {}'.format(highlighted_idx + 1))
-                intensity = float(max(led.as_tuple())) / 255.0 * 100.0
-                imgui.text('intensity: {:.2f}'.format(intensity))
-                imgui.text('color: #{:06X}'.format(int(led)))
+        if highlighted_idx > -1:
+            r, g, b = frame[highlighted_idx].tolist()
+            imgui.text('selected: {}'.format(highlighted_idx + 1))
+            imgui.text('intensity: {:.2f}'.format(max(r, g, b) / 255.0 * 100.0))
+            imgui.text('color: #{:06X}'.format(r << 16 | g << 8 | b))
 
 
 class ComboBox(object):
@@ -128,13 +180,34 @@ class ComboBox(object):
 
 
 
-def run():
+def sim_controls(clock, render_ms, steps):
+    if imgui.button('play' if clock.paused else 'pause'):
+        clock.pause(not clock.paused)
+    imgui.same_line()
+    if imgui.button('step') and clock.paused:
+        clock.step()
+    imgui.same_line()
+    imgui.push_item_width(80)
+    with imgui.begin_combo('speed', '{:g}x'.format(clock.speed)) as combo:
+        if combo.opened:
+            for speed in SimClock.SPEEDS:
+                if imgui.selectable('{:g}x'.format(speed), speed == clock.speed)[0]:
+                    clock.speed = speed
+    imgui.pop_item_width()
+    imgui.same_line()
+
+    m, sec = divmod(int(clock.time), 60)
+    imgui.text('t={:d}:{:02d}  render {:.2f} ms/frame ({:.0%} of budget)  {} steps{}'.format(
+        m, sec, render_ms, render_ms / (clock.dt * 1000.), steps, '  {} behind'.format(clock.behind) if clock.behind else ''))
+
+def run(led_count: int = LED_COUNT):
     window = init_window("TEST", (1200, 300), None)
 
     imgui.create_context()
     renderer = GlfwRenderer(window)
 
-    strip = Strip(LED_COUNT)
+    strip = Strip(led_count)
+    texture = LedTexture()
     runner = ProgramRunner(strip)
     current_running_idx = -1
 
@@ -145,6 +218,9 @@ def run():
     combo = ComboBox('effects', effects)
 
     freq = glfw.get_timer_frequency()
+    clock = SimClock(FRAMERATE)
+    render_ms = 0.
+    last_time = glfw.get_time()
 
     while not glfw.window_should_close(window):
         start_ticks = glfw.get_timer_value()
@@ -152,7 +228,13 @@ def run():
         glfw.poll_events()
         renderer.process_inputs()
 
-        runner.update(float(FRAMERATE) / 1000.0)
+        now = glfw.get_time()
+        steps = clock.advance(now - last_time)
+        last_time = now
+        for _ in range(steps):
+            t0 = time.perf_counter()
+            runner.update(clock.dt)
+            render_ms += ((time.perf_counter() - t0) * 1000. - render_ms) * .1
 
         imgui.new_frame()
 
@@ -162,7 +244,8 @@ def run():
         with imgui.begin('WINDOW', flags=imgui.WINDOW_NO_TITLE_BAR | imgui.WINDOW_NO_RESIZE | imgui.WINDOW_NO_MOVE | imgui.WINDOW_MENU_BAR):
 
             combo()
-            led_graph('##leds', strip.items())
+            sim_controls(clock, render_ms, steps)
+            led_graph('##leds', strip, texture)
 
         if current_running_idx != combo.selected:
             fx = combo.get_value()
@@ -178,6 +261,7 @@ def run():
         imgui.render()
         renderer.render(imgui.get_draw_data())
         glfw.swap_buffers(window)
+        startup.first_frame()
 
         imgui.end_frame()
 
@@ -186,5 +270,6 @@ def run():
             time.sleep(max(float(freq / FRAMERATE - frame_ticks) / float(freq), 0))
             frame_ticks = glfw.get_timer_value() - start_ticks
 
+    texture.delete()
     renderer.shutdown()
     glfw.terminate()
\ No newline at end of file